@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from . import authentication  # noqa: F401
+        from .cache import connect_signals
+        from .metrics import install_query_wrapper
+        connect_signals()
+        connection_created.connect(install_query_wrapper)
@@ -0,0 +1,113 @@
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connections
+from django.http import HttpResponse
+from django.urls import URLPattern
+from rest_framework.permissions import SAFE_METHODS
+
+
+def read_in_thread(view, request, *args, **kwargs):
+    """
+    Выполняет view и рендерит ответ в потоке из пула.
+
+    Отрендеренный ответ возвращается как HttpResponse, иначе Django
+    рендерит его еще раз в общем потоке. Потоковый ответ (выгрузки)
+    возвращается как есть, его перебирает ThreadedStream. Подключения
+    к базе у потоков пула свои, поэтому они закрываются здесь же,
+    как в конце запроса под WSGI.
+    """
+    try:
+        response = view(request, *args, **kwargs)
+        if response.streaming or not hasattr(response, 'render'):
+            return response
+        response.render()
+        rendered = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            rendered[header] = value
+        return rendered
+    finally:
+        close_old_connections()
+
+
+class ThreadedStream:
+    """
+    Асинхронный итератор по потоковому ответу для ASGI.
+
+    Django 3.2 перебирает streaming_content в цикле событий, где запросы
+    к базе запрещены. Здесь каждый кусок читается в отдельном потоке
+    ответа: курсор выгрузки и подключение к базе остаются в одном потоке,
+    клиент получает кусок сразу, а цикл событий между кусками
+    обслуживает другие запросы. Используется в api_yamdb.asgi.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.iterator = iter(response)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        chunk = await get_running_loop().run_in_executor(
+            self.executor, next, self.iterator, None
+        )
+        if chunk is None:
+            raise StopAsyncIteration
+        return chunk
+
+    async def aclose(self):
+        try:
+            await get_running_loop().run_in_executor(
+                self.executor, self.close
+            )
+        finally:
+            self.executor.shutdown(wait=False)
+
+    def close(self):
+        try:
+            self.response.close()
+        finally:
+            connections.close_all()
+
+
+def offload_reads(view):
+    """
+    Асинхронная обертка над view вьюсета для ASGI.
+
+    В Django 3.2 нет асинхронного ORM (aget, aiterator появились в 4.1),
+    а синхронные view под ASGI выполняются по очереди в одном общем
+    потоке. GET, HEAD и OPTIONS выполняются в пуле потоков параллельно
+    и не блокируют цикл событий, запись остается в общем потоке.
+    """
+    read = sync_to_async(read_in_thread, thread_sensitive=False)
+    write = sync_to_async(view)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await read(view, request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+
+    return async_view
+
+
+def offload_viewset_reads(patterns, viewsets):
+    """
+    Заменяет view маршрутов указанных вьюсетов и APIView на offload_reads.
+
+    Вложенные include не просматриваются.
+    """
+    return [
+        URLPattern(
+            pattern.pattern, offload_reads(pattern.callback),
+            pattern.default_args, pattern.name
+        )
+        if getattr(
+            getattr(pattern, 'callback', None), 'cls', None
+        ) in viewsets else pattern
+        for pattern in patterns
+    ]
@@ -0,0 +1,60 @@
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+
+USER_CACHE_ALIAS = 'users'
+
+
+def get_user_cache():
+    """
+    Кеш пользователей из JWT (settings.CACHES['users']).
+
+    Время жизни и размер задают JWT_USER_CACHE_TIMEOUT
+    и JWT_USER_CACHE_SIZE. LocMemCache при переполнении вытесняет
+    запись, к которой дольше всех не обращались.
+    """
+    return caches[USER_CACHE_ALIAS]
+
+
+def user_cache_key(user_id) -> str:
+    return f'jwt-user:{user_id}'
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса к таблице пользователей.
+
+    Пользователь из токена хранится в кеше users и удаляется из него
+    при изменении или удалении пользователя. is_active проверяется
+    и у пользователя из кеша.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        cache = get_user_cache()
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user)
+        elif not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    get_user_cache().delete(
+        user_cache_key(getattr(instance, api_settings.USER_ID_FIELD))
+    )
@@ -0,0 +1,170 @@
+from functools import partial
+from hashlib import md5
+from threading import Lock
+from time import time_ns
+
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from reviews.models import (Category, Comment, DataVersion, Genre, GenreTitle,
+                            Review, Title, is_deleting)
+from users.models import User
+
+CACHE_ALIAS = 'api'
+CATALOGUE = 'catalogue'
+# Все наборы данных сразу: входит в каждую версию, меняется после
+# массовой загрузки (load_data).
+ALL_DATA = 'all'
+# Версия набора, который еще ни разу не менялся.
+INITIAL_VERSION = 0
+INVALIDATING_MODELS = (Category, Genre, Title, GenreTitle, Review)
+
+
+class CacheStats:
+    """Счетчики попаданий и промахов кеша ответов в текущем процессе."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def as_dict(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+stats = CacheStats()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_version(*scopes):
+    """
+    Версия набора данных (каталог, отзывы произведения и т.п.).
+
+    Версия - время последнего изменения в наносекундах. Она входит
+    в ключи кеша и ETag, поэтому ее смена делает устаревшими все
+    сохраненные ответы без перебора ключей. Версии всех наборов
+    читаются из default одним запросом: реплика может отставать.
+    Набор, который еще не менялся, имеет версию INITIAL_VERSION:
+    чтение ничего не записывает. Для нескольких наборов возвращается
+    самая поздняя версия, с учетом версии ALL_DATA.
+    """
+    versions = DataVersion.objects.using(DEFAULT_DB_ALIAS).filter(
+        scope__in=(ALL_DATA, *scopes)
+    ).values_list('version', flat=True)
+    return max(versions, default=INITIAL_VERSION)
+
+
+def write_version(scope):
+    versions = DataVersion.objects.using(DEFAULT_DB_ALIAS)
+    version = Greatest(F('version') + 1, Value(time_ns()))
+    if versions.filter(scope=scope).update(version=version):
+        return
+    try:
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            versions.create(scope=scope, version=time_ns())
+    except IntegrityError:
+        versions.filter(scope=scope).update(version=version)
+
+
+def bump_version(scope):
+    """
+    Меняет версию набора после фиксации транзакции записи.
+
+    Строка версии обновляется вне транзакции записи и не держит
+    блокировку до ее конца. При откате версия не меняется.
+    """
+    transaction.on_commit(partial(write_version, scope))
+
+
+def normalized_url(request):
+    """Путь и отсортированные параметры запроса."""
+    query = '&'.join(
+        f'{name}={value}'
+        for name, values in sorted(request.query_params.lists())
+        for value in sorted(values)
+    )
+    return f'{request.path}?{query}'
+
+
+def make_key(request, version):
+    """
+    Ключ ответа для версии данных, от которых он зависит.
+
+    Схема и хост входят в ключ: ссылки next и previous пагинации
+    в ответе абсолютные.
+    """
+    digest = md5(
+        f'{request.scheme}://{request.get_host()}'
+        f'{normalized_url(request)}'.encode()
+    ).hexdigest()
+    return f'{CATALOGUE}:{version}:{digest}'
+
+
+def invalidate_catalogue(sender=None, instance=None, **kwargs):
+    # Отзывы и жанры удаляемого произведения: версию каталога один раз
+    # меняет удаление самого произведения.
+    if is_deleting(Title, getattr(instance, 'title_id', None)):
+        return
+    bump_version(CATALOGUE)
+
+
+def invalidate_reviews(sender, instance, **kwargs):
+    if not is_deleting(Title, instance.title_id):
+        bump_version(f'reviews:{instance.title_id}')
+
+
+def title_comments_scope(title_id):
+    """Комментарии ко всем отзывам произведения (?expand=reviews.comments)."""
+    return f'title-comments:{title_id}'
+
+
+def invalidate_comments(sender, instance, **kwargs):
+    # Комментарии удаляемого отзыва: список комментариев отвечает 404,
+    # а отзывы произведения меняет удаление самого отзыва.
+    if is_deleting(Review, instance.review_id):
+        return
+    bump_version(f'comments:{instance.review_id}')
+    title_id = Review.objects.filter(pk=instance.review_id).values_list(
+        'title_id', flat=True
+    ).first()
+    if title_id is not None:
+        bump_version(title_comments_scope(title_id))
+
+
+def invalidate_users(**kwargs):
+    bump_version('users')
+
+
+def connect_signals():
+    receivers = [
+        (invalidate_catalogue, model) for model in INVALIDATING_MODELS
+    ]
+    receivers += [
+        (invalidate_reviews, Review),
+        (invalidate_comments, Comment),
+        (invalidate_users, User),
+    ]
+    for receiver, model in receivers:
+        for action, signal in (('save', post_save), ('delete', post_delete)):
+            signal.connect(
+                receiver, sender=model,
+                dispatch_uid=f'{receiver.__name__}_{action}_{model.__name__}'
+            )
+    m2m_changed.connect(
+        invalidate_catalogue, sender=Title.genre.through,
+        dispatch_uid='invalidate_catalogue_title_genre'
+    )
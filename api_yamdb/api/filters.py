@@ -1,5 +1,8 @@
 from django_filters.rest_framework import CharFilter, FilterSet
+from rest_framework.filters import BaseFilterBackend
+
 from reviews.models import Title
+from reviews.search import search
 
 
 class TitleFilter(FilterSet):
@@ -11,3 +14,15 @@ class TitleFilter(FilterSet):
     class Meta:
         model = Title
         fields = ['name', 'year', 'category', 'genre']
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск ?search= с сортировкой по релевантности."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search(queryset, query)
@@ -0,0 +1,178 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+from django.conf import settings
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+current_metrics: ContextVar = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """Замеры одного запроса: время, запросы к базе, сериализация."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.total = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self._depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper для подключений к базе."""
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - started
+            self.queries += 1
+
+    def finish(self):
+        self.total = perf_counter() - self.started
+
+    def server_timing(self):
+        return (
+            f'total;dur={self.total * 1000:.1f}, '
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize_time * 1000:.1f}'
+        )
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    execute_wrapper всех подключений к базе.
+
+    Запрос учитывается в метриках текущего запроса из current_metrics.
+    ContextVar копируется в потоки sync_to_async, поэтому под ASGI
+    учитываются и запросы из пула потоков.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """Обработчик connection_created: подключает record_query."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def serializing():
+    """Учитывает время сериализации, вложенные сериализаторы не суммируются."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    metrics._depth += 1
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        metrics._depth -= 1
+        if not metrics._depth:
+            metrics.serialize_time += perf_counter() - started
+
+
+class TimedSerializerMixin:
+    """Миксин сериализатора, время to_representation попадает в метрики."""
+
+    def to_representation(self, instance):
+        with serializing():
+            return super().to_representation(instance)
+
+
+class RouteStats:
+    """Счетчики и последние замеры одного маршрута для перцентилей."""
+
+    fields = ('total', 'db_time', 'serialize_time', 'queries')
+
+    def __init__(self, samples):
+        self.count = 0
+        self.sums = dict.fromkeys(self.fields, 0.0)
+        self.samples = {field: deque(maxlen=samples) for field in self.fields}
+
+    def add(self, metrics):
+        self.count += 1
+        for field in self.fields:
+            value = getattr(metrics, field)
+            self.sums[field] += value
+            self.samples[field].append(value)
+
+
+class MetricsRegistry:
+    """Метрики всех маршрутов в памяти процесса."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.routes = {}
+
+    def record(self, route, metrics):
+        with self._lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats(
+                    getattr(settings, 'METRICS_SAMPLES', 1024)
+                )
+            stats.add(metrics)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                route: (
+                    stats.count,
+                    dict(stats.sums),
+                    {
+                        field: sorted(values)
+                        for field, values in stats.samples.items()
+                    }
+                )
+                for route, stats in self.routes.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self.routes.clear()
+
+
+registry = MetricsRegistry()
+
+PROMETHEUS_METRICS = (
+    ('total', 'api_request_duration_seconds', 'Время обработки запроса.'),
+    ('db_time', 'api_request_db_seconds', 'Время запросов к базе.'),
+    ('serialize_time', 'api_request_serialize_seconds',
+     'Время сериализации ответа.'),
+    ('queries', 'api_request_db_queries', 'Количество запросов к базе.'),
+)
+
+
+def quantile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def render_prometheus(extra_counters=None):
+    """Метрики в текстовом формате Prometheus."""
+    snapshot = registry.snapshot()
+    lines = []
+    for field, name, help_text in PROMETHEUS_METRICS:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} summary')
+        for route, (count, sums, samples) in sorted(snapshot.items()):
+            values = samples[field]
+            for q in QUANTILES:
+                lines.append(
+                    f'{name}{{route="{route}",quantile="{q}"}} '
+                    f'{quantile(values, q):.6f}'
+                )
+            lines.append(f'{name}_sum{{route="{route}"}} {sums[field]:.6f}')
+            lines.append(f'{name}_count{{route="{route}"}} {count}')
+    for name, (help_text, value) in (extra_counters or {}).items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,49 @@
+import asyncio
+
+from .metrics import RequestMetrics, current_metrics, registry
+
+
+class PerformanceMiddleware:
+    """
+    Замеряет каждый запрос по маршруту (titles-list, reviews-detail и т.п.).
+
+    Добавляет заголовок Server-Timing и копит метрики в registry,
+    которые отдает эндпоинт /api/v1/_metrics. Работает и под WSGI,
+    и под ASGI без переключения запроса в отдельный поток.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    @staticmethod
+    def finish(request, response, metrics):
+        metrics.finish()
+        match = request.resolver_match
+        registry.record(match.url_name if match else 'unmatched', metrics)
+        response['Server-Timing'] = metrics.server_timing()
+        return response
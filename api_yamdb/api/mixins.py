@@ -1,4 +1,20 @@
-from rest_framework import filters, mixins, viewsets
+from hashlib import md5
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils.functional import cached_property
+from django.utils.http import (http_date, parse_etags, parse_http_date_safe,
+                               quote_etag)
+from rest_framework import filters, mixins, serializers, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .cache import (CATALOGUE, get_cache, get_version, make_key,
+                    normalized_url, stats)
+from .replicas import (is_pinned, pin_to_primary, reading_from_replicas,
+                       replica_may_lag)
 
 
 class ListCreateDestroyViewSet(
@@ -16,3 +32,309 @@ class ListCreateDestroyViewSet(
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+
+
+class DataVersionMixin:
+    """Версии данных (api.cache), прочитанные за запрос один раз."""
+
+    _data_versions = None
+
+    def data_version(self, *scopes):
+        if self._data_versions is None:
+            self._data_versions = {}
+        key = frozenset(scopes)
+        if key not in self._data_versions:
+            self._data_versions[key] = get_version(*scopes)
+        return self._data_versions[key]
+
+
+class CachedListMixin(DataVersionMixin):
+    """
+    Кеширует ответы GET для list.
+
+    Ключ строится из пути и нормализованных параметров запроса, кеш
+    сбрасывается сигналами при изменении каталога (api.cache).
+    """
+
+    def get_cache_scopes(self):
+        """Наборы данных помимо каталога, от которых зависит ответ."""
+        return ()
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        version = self.data_version(CATALOGUE, *self.get_cache_scopes())
+        key = make_key(request, version)
+        data = cache.get(key)
+        if data is not None:
+            stats.hit()
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        stats.miss()
+        response = handler(request, *args, **kwargs)
+        if (
+            response.status_code == status.HTTP_200_OK
+            and not replica_may_lag(version)
+        ):
+            cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedListRetrieveMixin(CachedListMixin):
+    """Кеширует ответы GET для list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class BatchLookupMixin:
+    """
+    Список объектов по ?ids=1,2,3 одним запросом IN.
+
+    Значения - lookup_field вьюсета. Фильтры, select_related
+    и prefetch_related те же, что у list, порядок ответа совпадает
+    с порядком ids, не найденные значения перечисляются в missing.
+    Не больше batch_limit значений (по умолчанию BATCH_LOOKUP_LIMIT).
+    """
+
+    ids_param = 'ids'
+    batch_limit = None
+
+    def get_batch_limit(self):
+        return self.batch_limit or settings.BATCH_LOOKUP_LIMIT
+
+    def get_batch_ids(self, request):
+        values = [
+            value.strip()
+            for value in request.query_params[self.ids_param].split(',')
+            if value.strip()
+        ]
+        limit = self.get_batch_limit()
+        if not values or len(values) > limit:
+            raise ValidationError({
+                self.ids_param: f'Ожидается от 1 до {limit} значений.'
+            })
+        opts = self.get_queryset().model._meta
+        field = (
+            opts.pk if self.lookup_field == 'pk'
+            else opts.get_field(self.lookup_field)
+        )
+        try:
+            ids = [field.to_python(value) for value in values]
+        except DjangoValidationError as error:
+            raise ValidationError({self.ids_param: error.messages})
+        return list(dict.fromkeys(ids))
+
+    def list(self, request, *args, **kwargs):
+        if self.ids_param not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        ids = self.get_batch_ids(request)
+        found = self.filter_queryset(self.get_queryset()).in_bulk(
+            ids, field_name=self.lookup_field
+        )
+        serializer = self.get_serializer(
+            [found[value] for value in ids if value in found], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [value for value in ids if value not in found],
+        })
+
+
+class ConditionalGetMixin(DataVersionMixin):
+    """
+    Условные GET-запросы для list и retrieve.
+
+    ETag и Last-Modified берутся из версии набора данных (api.cache),
+    поэтому на If-None-Match ответ 304 отдается после одного запроса
+    версии, без чтения данных и сериализации страницы.
+    """
+
+    etag_scope = None
+
+    def get_etag_scope(self):
+        return self.etag_scope
+
+    def get_etag_scopes(self):
+        return (self.get_etag_scope(),)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        version = self.data_version(*self.get_etag_scopes())
+        etag = quote_etag(md5(
+            f'{version}:{request.accepted_media_type}:'
+            f'{normalized_url(request)}'.encode()
+        ).hexdigest())
+        last_modified = version // 10 ** 9
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            not_modified = etag in etags or '*' in etags
+        else:
+            if_modified_since = parse_http_date_safe(
+                request.META.get('HTTP_IF_MODIFIED_SINCE')
+            )
+            not_modified = (
+                if_modified_since is not None
+                and last_modified <= if_modified_since
+            )
+        if not_modified:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+            if replica_may_lag(version):
+                return response
+        if response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalListRetrieveMixin(ConditionalListMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ReplicaReadMixin:
+    """
+    Чтение безопасных запросов из реплик (api.replicas).
+
+    После успешной записи пользователь REPLICA_STICKY_SECONDS читает
+    из default, чтобы сразу видеть свои изменения. Ответы, прочитанные
+    из реплик в это же время после изменения данных, не кешируются.
+    """
+
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned(request):
+            self._replica_token = reading_from_replicas.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._replica_token is not None:
+            reading_from_replicas.reset(self._replica_token)
+            self._replica_token = None
+        elif (
+            response.status_code < status.HTTP_400_BAD_REQUEST
+            and request.method not in SAFE_METHODS
+        ):
+            pin_to_primary(request, response)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class SparseFieldsetMixin:
+    """
+    Выбор полей ответа для безопасных запросов.
+
+    ?fields=id,name оставляет только перечисленные поля, ?compact=true -
+    поля из compact_fields. Колонки незапрошенных полей не читаются
+    из базы (.only()), select_related и prefetch_related остаются только
+    для запрошенных связей. Колонки полей, которых нет в модели, задаются
+    в sparse_columns, колонки для пагинации - в sparse_required. Поля
+    из sparse_columns можно запросить, даже если их нет в сериализаторе
+    (например, связи из ?expand=).
+    Сериализатор должен принимать аргумент fields (SparseFieldsMixin).
+    """
+
+    fields_param = 'fields'
+    compact_param = 'compact'
+    compact_fields = ()
+    sparse_columns = {}
+    sparse_required = ()
+
+    @cached_property
+    def sparse_fields(self):
+        """Запрошенные поля или None, если нужны все."""
+        if self.request.method not in SAFE_METHODS:
+            return None
+        params = self.request.query_params
+        if params.get(self.compact_param, '').lower() in ('1', 'true'):
+            fields = list(self.compact_fields)
+        elif params.get(self.fields_param):
+            fields = [
+                name.strip() for name in params[self.fields_param].split(',')
+                if name.strip()
+            ]
+        else:
+            return None
+        available = self.get_serializer_class()().fields
+        unknown = [
+            name for name in fields
+            if name not in available and name not in self.sparse_columns
+        ]
+        if unknown:
+            raise ValidationError({
+                self.fields_param: f'Неизвестные поля: {", ".join(unknown)}.'
+            })
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        if self.sparse_fields is not None:
+            kwargs.setdefault('fields', self.sparse_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.sparse_fields is None:
+            return queryset
+        return self.sparse_queryset(queryset, self.sparse_fields)
+
+    def sparse_queryset(self, queryset, fields):
+        """Оставляет в запросе колонки и связи только для fields."""
+        model = queryset.model
+        serializer_fields = self.get_serializer_class()().fields
+        columns = [model._meta.pk.name, *self.sparse_required]
+        select_related, prefetch_related = [], []
+        for name in fields:
+            if name in self.sparse_columns:
+                columns.extend(self.sparse_columns[name])
+                continue
+            field = serializer_fields[name]
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                continue
+            if model_field.many_to_many:
+                prefetch_related.append(field.source)
+            elif model_field.is_relation:
+                select_related.append(field.source)
+                columns.extend(
+                    f'{field.source}__{column}'
+                    for column in self.related_columns(field)
+                )
+            else:
+                columns.append(field.source)
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset.only(*columns)
+
+    @staticmethod
+    def related_columns(field):
+        """Колонки связанной модели, которые читает поле сериализатора."""
+        if isinstance(field, serializers.SlugRelatedField):
+            return [field.slug_field]
+        if isinstance(field, serializers.BaseSerializer):
+            return [child.source for child in field.fields.values()]
+        return ['pk']
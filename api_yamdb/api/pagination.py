@@ -0,0 +1,57 @@
+from django.conf import settings
+from rest_framework.pagination import (BasePagination, CursorPagination,
+                                       PageNumberPagination)
+
+CURSOR_MODE = 'cursor'
+PAGE_MODE = 'page'
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Keyset-пагинация по дате публикации, id разрешает совпадения."""
+
+    ordering = ('pub_date', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = CursorPagination.page_size
+
+
+class ReviewPagination(BasePagination):
+    """
+    Пагинация отзывов и комментариев.
+
+    По умолчанию постраничная, режим по курсору выбирается параметром
+    ?pagination=cursor, наличием ?cursor= или настройкой REVIEWS_PAGINATION.
+    В режиме курсора нет OFFSET и запроса COUNT(*).
+    """
+
+    mode_query_param = 'pagination'
+
+    def __init__(self):
+        self.paginator = PageNumberPagination()
+
+    def get_mode(self, request):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode in (CURSOR_MODE, PAGE_MODE):
+            return mode
+        if PubDateCursorPagination.cursor_query_param in request.query_params:
+            return CURSOR_MODE
+        return getattr(settings, 'REVIEWS_PAGINATION', PAGE_MODE)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.get_mode(request) == CURSOR_MODE:
+            self.paginator = PubDateCursorPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_fields(self, view):
+        return self.paginator.get_schema_fields(view)
+
+    def get_schema_operation_parameters(self, view):
+        return self.paginator.get_schema_operation_parameters(view)
@@ -0,0 +1,71 @@
+import random
+from contextvars import ContextVar
+from time import time_ns
+
+from django.conf import settings
+
+# Включается на время безопасных запросов к вьюсетам API,
+# все остальные чтения (команды, сигналы, запись) идут в default.
+reading_from_replicas: ContextVar = ContextVar(
+    'reading_from_replicas', default=False
+)
+
+
+PIN_COOKIE = 'replica_pin'
+PIN_SALT = 'api.replicas.pin'
+
+
+def pin_to_primary(request, response) -> None:
+    """
+    После записи пользователь читает из default, пока реплики догоняют.
+
+    Отметка хранится у клиента в подписанной cookie: следующий запрос
+    может попасть в другой процесс с другим локальным кешем.
+    """
+    if request.user.is_authenticated:
+        response.set_signed_cookie(
+            PIN_COOKIE, request.user.pk, salt=PIN_SALT,
+            max_age=settings.REPLICA_STICKY_SECONDS,
+            httponly=True, samesite='Lax'
+        )
+
+
+def is_pinned(request) -> bool:
+    return request.user.is_authenticated and request.get_signed_cookie(
+        PIN_COOKIE, default=None, salt=PIN_SALT,
+        max_age=settings.REPLICA_STICKY_SECONDS
+    ) == str(request.user.pk)
+
+
+def replica_may_lag(version: int) -> bool:
+    """
+    Данные прочитаны из реплики вскоре после изменения версии.
+
+    Реплика могла еще не получить изменение, поэтому такой ответ
+    не кешируется и не получает ETag новой версии.
+    """
+    return (
+        bool(settings.DATABASE_REPLICAS) and reading_from_replicas.get()
+        and time_ns() - version < settings.REPLICA_STICKY_SECONDS * 10 ** 9
+    )
+
+
+class ReplicaRouter:
+    """
+    Отправляет чтения безопасных запросов API на реплики.
+
+    Реплика выбирается случайно из settings.DATABASE_REPLICAS,
+    запись всегда идет в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and reading_from_replicas.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Все базы содержат одни и те же данные.
+        return True
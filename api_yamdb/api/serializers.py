@@ -5,11 +5,24 @@ from django.contrib.auth.models import AbstractUser
 from rest_framework import filters, serializers
 from rest_framework.relations import SlugRelatedField
 
+from reviews.const import SCORES
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 
+from .metrics import TimedSerializerMixin
 
-class CategorySerializer(serializers.ModelSerializer):
+
+class SparseFieldsMixin:
+    """Сериализатор с аргументом fields: выводятся только эти поля."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
 
@@ -19,7 +32,7 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
 
@@ -29,13 +42,17 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SparseFieldsMixin, TimedSerializerMixin,
+                      serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
     rating = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = '__all__'
+        exclude = (
+            'review_count', 'score_sum',
+            *(f'score_{score}' for score in SCORES)
+        )
         model = Title
 
     def validate_year(self, value):
@@ -44,7 +61,45 @@ class TitleSerializer(serializers.ModelSerializer):
         return value
 
 
-class UserSerializer(serializers.ModelSerializer):
+class TitleDetailSerializer(TitleSerializer):
+    """
+    Произведение с распределением оценок для retrieve.
+
+    Отзывы, загруженные вьюсетом для ?expand= (expanded_reviews),
+    выводятся в поле reviews.
+    """
+
+    percentiles = (25, 50, 75, 90)
+
+    score_histogram = serializers.SerializerMethodField()
+    score_median = serializers.SerializerMethodField()
+    score_percentiles = serializers.SerializerMethodField()
+
+    def get_score_histogram(self, obj):
+        return {
+            str(score): count for score, count in obj.score_histogram.items()
+        }
+
+    def get_score_median(self, obj):
+        return obj.score_percentile(0.5)
+
+    def get_score_percentiles(self, obj):
+        return {
+            f'p{percentile}': obj.score_percentile(percentile / 100)
+            for percentile in self.percentiles
+        }
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if hasattr(instance, 'expanded_reviews'):
+            data['reviews'] = inline_page(
+                ExpandedReviewSerializer, instance.expanded_reviews,
+                instance.review_count, self.context
+            )
+        return data
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
 
     class Meta:
@@ -53,7 +108,7 @@ class UserSerializer(serializers.ModelSerializer):
                   'last_name', 'bio', 'role',)
 
 
-class NotAdminSerializer(serializers.ModelSerializer):
+class NotAdminSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -96,7 +151,8 @@ class AuthTokenSerializer(serializers.Serializer):
         fields = ('username', 'confirmation_code')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, TimedSerializerMixin,
+                       serializers.ModelSerializer):
     author = SlugRelatedField(slug_field='username', read_only=True)
 
     class Meta:
@@ -117,9 +173,31 @@ class ReviewSerializer(serializers.ModelSerializer):
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, TimedSerializerMixin,
+                        serializers.ModelSerializer):
     author = SlugRelatedField(read_only=True, slug_field='username')
 
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
+
+
+class ExpandedReviewSerializer(ReviewSerializer):
+    """Отзыв внутри произведения, с первыми комментариями для ?expand=."""
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if hasattr(instance, 'expanded_comments'):
+            data['comments'] = inline_page(
+                CommentSerializer, instance.expanded_comments,
+                instance.comment_count, self.context
+            )
+        return data
+
+
+def inline_page(serializer_class, objects, count, context):
+    """Первая страница связанных объектов внутри ответа."""
+    return {
+        'count': count,
+        'results': serializer_class(objects, many=True, context=context).data,
+    }
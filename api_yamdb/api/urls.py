@@ -1,10 +1,12 @@
 from api.views import (
-    APIGetToken, APISignup, CategoryViewSet, GenreViewSet,
-    TitleViewSet, UserViewSet, ReviewViewSet, CommentViewSet
+    APIExport, APIGetToken, APIMetrics, APISignup, CategoryViewSet,
+    GenreViewSet, TitleViewSet, UserViewSet, ReviewViewSet, CommentViewSet
 )
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from api.async_views import offload_viewset_reads
+
 router_v1 = DefaultRouter()
 
 router_v1.register('categories', CategoryViewSet),
@@ -25,7 +27,28 @@ auth_pattterns = [
     path('token/', APIGetToken.as_view(), name='get_token'),
     path('signup/', APISignup.as_view(), name='signup')
 ]
-urlpatterns = [
-    path('', include(router_v1.urls)),
-    path('auth/', include(auth_pattterns)),
-]
+
+
+def build_urlpatterns(router_urls):
+    return [
+        path('', include(router_urls)),
+        path('auth/', include(auth_pattterns)),
+        path('_metrics', APIMetrics.as_view(), name='metrics'),
+        path(
+            'export/<str:name>.<str:file_format>',
+            APIExport.as_view(),
+            name='export'
+        ),
+    ]
+
+
+urlpatterns = build_urlpatterns(router_v1.urls)
+# Маршруты для ASGI (api_yamdb/asgi.py): чтение произведений, отзывов
+# и комментариев выполняется асинхронными view, выгрузка собирается
+# в пуле потоков, а не в цикле событий.
+asgi_urlpatterns = offload_viewset_reads(
+    build_urlpatterns(offload_viewset_reads(
+        router_v1.urls, (TitleViewSet, ReviewViewSet, CommentViewSet)
+    )),
+    (APIExport,)
+)
@@ -1,31 +1,49 @@
-from django.core.mail import EmailMessage
-from django.db.models import Avg
+from functools import partial
+
+from django.db import transaction
+from django.db.models import (Count, OuterRef, Subquery,
+                              prefetch_related_objects)
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import (IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Review, Title, Comment
+from reviews.const import SCORES
+from reviews.export import CONTENT_TYPES, EXPORTS, export_chunks
+from reviews.functions import save_titles
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title)
 from users.models import User
 from api.serializers import (AuthSignUpSerializer, AuthTokenSerializer,
                              CategorySerializer, GenreSerializer,
-                             TitleSerializer)
-from .filters import TitleFilter
-from .mixins import ListCreateDestroyViewSet
+                             TitleDetailSerializer, TitleSerializer)
+from .filters import FullTextSearchFilter, TitleFilter
+from . import cache
+from .cache import CATALOGUE, title_comments_scope
+from .metrics import render_prometheus
+from .mixins import (BatchLookupMixin, CachedListMixin,
+                     CachedListRetrieveMixin,
+                     ConditionalListMixin, ConditionalListRetrieveMixin,
+                     ListCreateDestroyViewSet, ReplicaReadMixin,
+                     SparseFieldsetMixin)
+from .pagination import ReviewPagination
 from .permissions import (AdminModerAuthorOrReadOnly, AdminOrReadOnly,
                           AdminOrSuperuser)
 from .serializers import (CommentSerializer, NotAdminSerializer,
                           ReviewSerializer, UserSerializer)
-from users.functions import create_confirmation_code
+from users.functions import create_confirmation_code, enqueue_email
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(ReplicaReadMixin, ConditionalListMixin,
+                      CachedListMixin, ListCreateDestroyViewSet):
     """
     Разрешенные методы GET, PUT, DELETE.
 
@@ -35,9 +53,11 @@ class CategoryViewSet(ListCreateDestroyViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AdminOrReadOnly]
+    etag_scope = CATALOGUE
 
 
-class GenreViewSet(ListCreateDestroyViewSet):
+class GenreViewSet(ReplicaReadMixin, ConditionalListMixin, CachedListMixin,
+                   ListCreateDestroyViewSet):
     """
     Разрешенные методы GET, PUT, DELETE.
 
@@ -47,21 +67,123 @@ class GenreViewSet(ListCreateDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = [AdminOrReadOnly]
+    etag_scope = CATALOGUE
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReplicaReadMixin, SparseFieldsetMixin,
+                   ConditionalListRetrieveMixin, CachedListRetrieveMixin,
+                   BatchLookupMixin, viewsets.ModelViewSet):
     """
     Разрешены все методы.
 
     Но права на изменения только у Админа.
+    ?fields= и ?compact=true - выбор полей ответа (SparseFieldsetMixin).
+    ?expand=reviews,reviews.comments - отзывы и комментарии в retrieve,
+    вместе с ?fields= - только если среди полей есть reviews.
+    ?ids=1,2,3 - список произведений по id (BatchLookupMixin).
     """
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('rating')
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('rating', 'id')
     serializer_class = TitleSerializer
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, FullTextSearchFilter)
     filterset_class = TitleFilter
     permission_classes = [AdminOrReadOnly]
+    etag_scope = CATALOGUE
+    compact_fields = ('id', 'name', 'year', 'rating')
+    # Распределение оценок в TitleDetailSerializer считается по счетчикам,
+    # общее число отзывов для ?expand=reviews - review_count.
+    sparse_columns = {
+        **dict.fromkeys(
+            ('score_histogram', 'score_median', 'score_percentiles'),
+            [f'score_{score}' for score in SCORES]
+        ),
+        'reviews': ['review_count'],
+    }
+    bulk_limit = 1000
+    top_limit = 10
+    top_max_limit = 100
+    expand_param = 'expand'
+    expand_reviews_limit = 10
+    expand_comments_limit = 5
+
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return TitleDetailSerializer
+        return TitleSerializer
+
+    @cached_property
+    def expand(self):
+        """Связанные данные из ?expand= для retrieve."""
+        if self.action != 'retrieve':
+            return set()
+        expand = {
+            name.strip()
+            for name in self.request.query_params.get(
+                self.expand_param, ''
+            ).split(',')
+            if name.strip()
+        }
+        unknown = expand - {'reviews', 'reviews.comments'}
+        if unknown:
+            raise ValidationError({
+                self.expand_param: (
+                    f'Неизвестные связи: {", ".join(sorted(unknown))}.'
+                )
+            })
+        if 'reviews.comments' in expand:
+            expand.add('reviews')
+        if self.sparse_fields is not None and 'reviews' not in (
+            self.sparse_fields
+        ):
+            return set()
+        return expand
+
+    def get_cache_scopes(self):
+        # Комментарии не меняют версию каталога.
+        if 'reviews.comments' in self.expand:
+            return (title_comments_scope(self.kwargs[self.lookup_field]),)
+        return ()
+
+    def get_etag_scopes(self):
+        return (self.get_etag_scope(), *self.get_cache_scopes())
+
+    def get_object(self):
+        title = super().get_object()
+        if self.expand:
+            self.expand_reviews(title)
+        return title
+
+    def expand_reviews(self, title):
+        """
+        Первые отзывы произведения и первые комментарии к ним.
+
+        Отзывы с авторами (и числом комментариев) читаются одним
+        запросом, комментарии всех этих отзывов - вторым, не больше
+        expand_comments_limit на отзыв. Порядок как у пагинации
+        по курсору.
+        """
+        with_comments = 'reviews.comments' in self.expand
+        reviews = Review.objects.filter(title=title).select_related('author')
+        if with_comments:
+            reviews = reviews.annotate(comment_count=Count('comments'))
+        title.expanded_reviews = reviews = list(
+            reviews.order_by('pub_date', 'id')[:self.expand_reviews_limit]
+        )
+        if not with_comments or not reviews:
+            return
+        first_comments = Comment.objects.filter(
+            review=OuterRef('review')
+        ).order_by('pub_date', 'id').values('pk')[:self.expand_comments_limit]
+        comments = Comment.objects.filter(
+            review__in=reviews, pk__in=Subquery(first_comments)
+        ).select_related('author').order_by('pub_date', 'id')
+        by_id = {review.pk: review for review in reviews}
+        for review in reviews:
+            review.expanded_comments = []
+        for comment in comments:
+            by_id[comment.review_id].expanded_comments.append(comment)
 
     def perform_create(self, serializer):
         category = get_object_or_404(
@@ -75,13 +197,118 @@ class TitleViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         self.perform_create(serializer)
 
+    @action(detail=False, url_path='top')
+    def top(self, request):
+        """
+        Лучшие произведения по рейтингу.
+
+        ?limit= (по умолчанию top_limit), фильтры category, genre, year.
+        Произведения без отзывов в список не попадают, при равном
+        рейтинге выше более раннее. Запрос идет по индексу
+        title_rating_idx и читает только первые limit строк.
+        """
+        return self.conditional_response(
+            partial(self.cached_response, self.top_titles), request
+        )
+
+    def top_titles(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.top_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'Ожидается целое число.'})
+        limit = min(max(limit, 1), self.top_max_limit)
+        titles = self.filter_queryset(self.get_queryset()).filter(
+            rating__isnull=False
+        ).order_by('-rating', 'id')[:limit]
+        return Response(self.get_serializer(titles, many=True).data)
+
+    @action(detail=False, methods=('post',), url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Создание списка произведений одним запросом.
+
+        Категории и жанры всех элементов ищутся двумя запросами,
+        произведения пишутся save_titles, связи с жанрами - bulk_create,
+        версия каталога меняется один раз на весь список.
+        Ошибки возвращаются по индексу элемента и не отменяют
+        создание остальных произведений.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {'detail': 'Ожидается список произведений.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.bulk_limit:
+            return Response(
+                {'detail': f'Не больше {self.bulk_limit} произведений.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        items = [item if isinstance(item, dict) else {} for item in items]
+        genre_slugs = [item.get('genre') or [] for item in items]
+        genre_slugs = [
+            slugs if isinstance(slugs, list)
+            and all(isinstance(slug, str) for slug in slugs) else None
+            for slugs in genre_slugs
+        ]
+        categories = Category.objects.in_bulk(
+            {str(item.get('category')) for item in items}, field_name='slug'
+        )
+        genres = Genre.objects.in_bulk(
+            {slug for slugs in genre_slugs for slug in slugs or ()},
+            field_name='slug'
+        )
+        titles, title_genres, errors = [], [], []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            serializer.is_valid()
+            item_errors = dict(serializer.errors)
+            category = categories.get(str(item.get('category')))
+            if category is None:
+                item_errors['category'] = ['Категория не найдена.']
+            item_genres = [
+                genres.get(slug) for slug in genre_slugs[index] or ()
+            ]
+            if genre_slugs[index] is None:
+                item_errors['genre'] = ['Ожидается список slug жанров.']
+            elif None in item_genres:
+                item_errors['genre'] = ['Жанр не найден.']
+            if item_errors:
+                errors.append({'index': index, 'errors': item_errors})
+                continue
+            title = Title(**serializer.validated_data, category=category)
+            titles.append(title)
+            title_genres.append((title, set(item_genres)))
+        with transaction.atomic():
+            save_titles(titles)
+            GenreTitle.objects.bulk_create(
+                GenreTitle(title=title, genre=genre)
+                for title, item_genres in title_genres
+                for genre in item_genres
+            )
+            if titles:
+                cache.bump_version(CATALOGUE)
+        prefetch_related_objects(titles, 'genre')
+        return Response(
+            {
+                'created': self.get_serializer(titles, many=True).data,
+                'errors': errors,
+            },
+            status=(
+                status.HTTP_201_CREATED if titles
+                else status.HTTP_400_BAD_REQUEST
+            )
+        )
+
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadMixin, ConditionalListRetrieveMixin,
+                  BatchLookupMixin, viewsets.ModelViewSet):
     """
     Разрешены методы GET, PATCH, POST, DELETE.
 
     Права только у администратора. Получение/изменение
     данных своей учетной записи - авторизованный пользователь
+    ?ids=username1,username2 - список пользователей по username.
     """
 
     queryset = User.objects.all()
@@ -92,6 +319,7 @@ class UserViewSet(viewsets.ModelViewSet):
     ordering = ['username']
     search_fields = ['username']
     http_method_names = ['get', 'patch', 'post', 'delete']
+    etag_scope = 'users'
 
     @action(detail=False,
             methods=('get', 'patch'),
@@ -137,6 +365,53 @@ class APIGetToken(APIView):
             status=status.HTTP_400_BAD_REQUEST)
 
 
+class APIMetrics(APIView):
+    """
+    Метрики производительности в формате Prometheus.
+
+    Права доступа: Администратор.
+    """
+
+    permission_classes = (IsAuthenticated, AdminOrSuperuser,)
+
+    def get(self, request):
+        cache_stats = cache.stats.as_dict()
+        return HttpResponse(
+            render_prometheus({
+                'api_response_cache_hits_total': (
+                    'Ответы из кеша каталога.', cache_stats['hits']
+                ),
+                'api_response_cache_misses_total': (
+                    'Промахи кеша каталога.', cache_stats['misses']
+                ),
+            }),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+class APIExport(APIView):
+    """
+    Потоковая выгрузка таблицы в csv или ndjson.
+
+    Колонки совпадают с static/data/*.csv.
+    Права доступа: Администратор.
+    """
+
+    permission_classes = (IsAuthenticated, AdminOrSuperuser,)
+
+    def get(self, request, name, file_format):
+        if name not in EXPORTS or file_format not in CONTENT_TYPES:
+            raise Http404('Выгрузка не найдена.')
+        response = StreamingHttpResponse(
+            export_chunks(name, file_format),
+            content_type=CONTENT_TYPES[file_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{name}.{file_format}"'
+        )
+        return response
+
+
 class APISignup(APIView):
     """
     Получить код подтверждения на переданный email.
@@ -146,12 +421,12 @@ class APISignup(APIView):
 
     @staticmethod
     def send_email(data):
-        email = EmailMessage(
+        """Письмо ставится в очередь, отправляет его команда send_emails."""
+        enqueue_email(
             subject=data['email_subject'],
             body=data['email_body'],
-            to=[data['to_email']]
+            to_email=data['to_email']
         )
-        email.send()
 
     def post(self, request):
         serializer = AuthSignUpSerializer(data=request.data)
@@ -173,31 +448,58 @@ class APISignup(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ReplicaReadMixin, SparseFieldsetMixin,
+                    ConditionalListRetrieveMixin, BatchLookupMixin,
+                    viewsets.ModelViewSet):
     """
     Разрешенные методы GET, POST, PATCH, DELETE.
 
     Права доступа: GET - Доступно без токена.
     POST - Аутентифицированные пользователи
     PATCH, DELETE - Автор, модер, админ
+    ?fields= и ?compact=true - выбор полей ответа (SparseFieldsetMixin).
+    ?ids=1,2,3 - отзывы произведения по id (BatchLookupMixin).
     """
 
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         AdminModerAuthorOrReadOnly
     ]
-    pagination_class = PageNumberPagination
-    filter_backends = [filters.SearchFilter]
+    pagination_class = ReviewPagination
+    filter_backends = [FullTextSearchFilter]
     serializer_class = ReviewSerializer
-
-    def title_query(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+    compact_fields = ('id', 'author', 'score', 'pub_date')
+    # pub_date нужна пагинации по курсору для ссылок на страницы.
+    sparse_required = ('pub_date',)
+
+    def get_etag_scope(self):
+        # Произведение проверяется до ETag: на несуществующее - 404,
+        # а не 304 на If-None-Match: *.
+        return f'reviews:{self.title_id}'
+
+    @cached_property
+    def title_id(self):
+        """
+        id произведения из url, проверенный одним запросом EXISTS.
+
+        Результат кешируется на вьюсете до конца запроса.
+        """
+        title_id = self.kwargs.get('title_id')
+        if not Title.objects.filter(pk=title_id).exists():
+            raise Http404('Произведение не найдено.')
+        return title_id
 
     def get_queryset(self):
-        return Review.objects.filter(title=self.title_query().id)
+        # Отзыв по id ищется с фильтром по произведению,
+        # отдельная проверка произведения ему не нужна.
+        title_id = (
+            self.kwargs.get('title_id') if self.lookup_field in self.kwargs
+            else self.title_id
+        )
+        return Review.objects.filter(title=title_id).select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.title_query())
+        serializer.save(author=self.request.user, title_id=self.title_id)
 
 
 class CommentViewSet(ReviewViewSet):
@@ -210,16 +512,34 @@ class CommentViewSet(ReviewViewSet):
     """
 
     serializer_class = CommentSerializer
+    compact_fields = ('id', 'author', 'text')
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         AdminModerAuthorOrReadOnly
     ]
 
-    def review_query(self):
-        return get_object_or_404(Review, id=self.kwargs.get('review_id'))
+    def get_etag_scope(self):
+        return f'comments:{self.review_id}'
+
+    @cached_property
+    def review_id(self):
+        """id отзыва из url, проверено, что отзыв относится к произведению."""
+        review_id = self.kwargs.get('review_id')
+        if not Review.objects.filter(
+            pk=review_id, title=self.kwargs.get('title_id')
+        ).exists():
+            raise Http404('Отзыв не найден.')
+        return review_id
 
     def get_queryset(self):
-        return Comment.objects.filter(review=self.review_query().id)
+        if self.lookup_field in self.kwargs:
+            return Comment.objects.filter(
+                review=self.kwargs.get('review_id'),
+                review__title=self.kwargs.get('title_id')
+            ).select_related('author')
+        return Comment.objects.filter(
+            review=self.review_id
+        ).select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.review_query())
+        serializer.save(author=self.request.user, review_id=self.review_id)
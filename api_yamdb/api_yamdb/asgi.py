@@ -1,7 +1,64 @@
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler, ASGIRequest
+
+from api.async_views import ThreadedStream
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+
+class AsyncReadsRequest(ASGIRequest):
+    """Запрос под ASGI разрешается по api_yamdb.urls_asgi."""
+
+    urlconf = 'api_yamdb.urls_asgi'
+
+
+class AsyncReadsHandler(ASGIHandler):
+    request_class = AsyncReadsRequest
+
+    async def send_response(self, response, send):
+        """Потоковый ответ отдается по кускам из ThreadedStream."""
+        if not response.streaming:
+            return await super().send_response(response, send)
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': response_headers(response),
+        })
+        stream = ThreadedStream(response)
+        try:
+            async for part in stream:
+                for chunk, _ in self.chunk_bytes(part):
+                    await send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+            await send({'type': 'http.response.body'})
+        finally:
+            await stream.aclose()
+
+
+def response_headers(response):
+    """Заголовки и cookies ответа в виде ASGI, как в ASGIHandler."""
+    headers = [
+        (
+            header.encode('ascii') if isinstance(header, str) else header,
+            value.encode('latin1') if isinstance(value, str) else value,
+        )
+        for header, value in response.items()
+    ]
+    headers += [
+        (b'Set-Cookie', cookie.output(header='').encode('ascii').strip())
+        for cookie in response.cookies.values()
+    ]
+    return headers
+
+
+def get_application():
+    django.setup(set_prefix=False)
+    return AsyncReadsHandler()
+
+
+application = get_application()
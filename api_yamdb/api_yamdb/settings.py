@@ -38,6 +38,7 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    'api.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,6 +79,39 @@ DATABASES = {
     }
 }
 
+# Реплики для чтения: пути к файлам SQLite через запятую. Реплики
+# на PostgreSQL добавляются в DATABASES с именем replica<N> вручную.
+for number, name in enumerate(
+    filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')), start=1
+):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Настройки подключений SQLite (PRAGMA), выполняются при каждом
+# подключении. production включает WAL, чтобы чтение не блокировало
+# запись, и ждет блокировку busy_timeout мс вместо ошибки
+# database is locked.
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'production')
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+# Сколько секунд после записи пользователь читает из default.
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
+
 
 # Password validation
 
@@ -109,6 +143,42 @@ USE_L10N = True
 USE_TZ = True
 
 
+# Cache
+
+# Сколько секунд пользователь из JWT живет в кеше users
+# и сколько пользователей кеш хранит.
+JWT_USER_CACHE_TIMEOUT = 60
+JWT_USER_CACHE_SIZE = 10000
+
+# Кеш ответов каталога: по умолчанию в памяти процесса, для общего кеша
+# укажите бэкенд memcached/redis и его адрес. Кеш пользователей из JWT
+# при нескольких процессах должен быть общим: иначе смена роли или
+# удаление пользователя сбрасывают его только в процессе, который
+# выполнил запись.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': os.getenv(
+            'API_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('API_CACHE_LOCATION', 'api-responses'),
+        'TIMEOUT': int(os.getenv('API_CACHE_TIMEOUT', 300)),
+    },
+    'users': {
+        'BACKEND': os.getenv(
+            'USERS_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('USERS_CACHE_LOCATION', 'jwt-users'),
+        'TIMEOUT': JWT_USER_CACHE_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': JWT_USER_CACHE_SIZE},
+    },
+}
+
+
 # Static files (CSS, JavaScript, Images)
 
 STATIC_URL = '/static/'
@@ -120,16 +190,32 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ),
+    # api.renderers.FastJSONRenderer рендерит JSON через orjson, если он
+    # установлен. Для стандартного рендеринга замените его на
+    # rest_framework.renderers.JSONRenderer.
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100
 }
 
+# Пагинация отзывов и комментариев по умолчанию: 'page' или 'cursor'.
+REVIEWS_PAGINATION = os.getenv('REVIEWS_PAGINATION', 'page')
+
+# Сколько объектов можно запросить одним ?ids=.
+BATCH_LOOKUP_LIMIT = int(os.getenv('BATCH_LOOKUP_LIMIT', 100))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     # 'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько последних замеров на маршрут хранится для перцентилей.
+METRICS_SAMPLES = 1024
+
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -2,12 +2,17 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
-urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('api/v1/', include('api.urls')),
-    path(
-        'redoc/',
-        TemplateView.as_view(template_name='redoc.html'),
-        name='redoc'
-    ),
-]
+
+def build_urlpatterns(api_urls):
+    return [
+        path('admin/', admin.site.urls),
+        path('api/v1/', include(api_urls)),
+        path(
+            'redoc/',
+            TemplateView.as_view(template_name='redoc.html'),
+            name='redoc'
+        ),
+    ]
+
+
+urlpatterns = build_urlpatterns('api.urls')
@@ -0,0 +1,6 @@
+from api.urls import asgi_urlpatterns
+from .urls import build_urlpatterns
+
+# URLconf для ASGI: те же маршруты, но чтение titles, reviews и comments
+# выполняется асинхронными view из api.async_views.
+urlpatterns = build_urlpatterns(asgi_urlpatterns)
@@ -0,0 +1,11 @@
+from django import apps
+from django.db.backends.signals import connection_created
+
+
+class AppConfig(apps.AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'app'
+
+    def ready(self):
+        from .sqlite import apply_sqlite_profile
+        connection_created.connect(apply_sqlite_profile)
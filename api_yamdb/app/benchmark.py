@@ -0,0 +1,377 @@
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from statistics import mean
+from time import perf_counter, sleep
+
+from asgiref.testing import ApplicationCommunicator
+from django.db import OperationalError, connection, connections, transaction
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.metrics import quantile
+from api.serializers import ReviewSerializer, TitleSerializer
+from reviews.functions import rebuild_title_ratings
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.search import rebuild_search_index
+from users.models import User
+
+ASGI_TIMEOUT: int = 60
+SEED_BATCH_SIZE: int = 5000
+CATEGORIES_COUNT: int = 10
+GENRES_COUNT: int = 20
+
+
+def bulk_insert(model, objs, batch_size=SEED_BATCH_SIZE):
+    """Записывает генератор объектов пачками, не держа их все в памяти."""
+    objs = iter(objs)
+    while True:
+        batch = list(islice(objs, batch_size))
+        if not batch:
+            return
+        with transaction.atomic():
+            model.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def seed(users, titles, reviews, comments):
+    """
+    Заполняет базу синтетическими данными заданного объема.
+
+    id задаются явно, отзыв i принадлежит произведению i % titles
+    от автора (i // titles) % users, поэтому пара автор/произведение
+    уникальна, пока reviews <= titles * users.
+    """
+    bulk_insert(Category, (
+        Category(id=i, name=f'Категория {i}', slug=f'category{i}')
+        for i in range(1, CATEGORIES_COUNT + 1)
+    ))
+    bulk_insert(Genre, (
+        Genre(id=i, name=f'Жанр {i}', slug=f'genre{i}')
+        for i in range(1, GENRES_COUNT + 1)
+    ))
+    bulk_insert(User, (
+        User(id=i, username=f'bench{i}', email=f'bench{i}@yamdb.fake')
+        for i in range(1, users + 1)
+    ))
+    bulk_insert(Title, (
+        Title(
+            id=i,
+            name=f'Произведение {i}',
+            year=1900 + i % 120,
+            description=f'Описание произведения номер {i}',
+            category_id=i % CATEGORIES_COUNT + 1
+        )
+        for i in range(1, titles + 1)
+    ))
+    bulk_insert(GenreTitle, (
+        GenreTitle(title_id=i, genre_id=(i + shift) % GENRES_COUNT + 1)
+        for i in range(1, titles + 1) for shift in (0, 7)
+    ))
+    bulk_insert(Review, (
+        Review(
+            id=i + 1,
+            title_id=i % titles + 1,
+            author_id=(i // titles) % users + 1,
+            text=f'Отзыв номер {i}',
+            score=i % 10 + 1
+        )
+        for i in range(reviews)
+    ))
+    bulk_insert(Comment, (
+        Comment(
+            id=i + 1,
+            review_id=i % reviews + 1,
+            author_id=i % users + 1,
+            text=f'Комментарий номер {i}'
+        )
+        for i in range(comments)
+    ))
+    rebuild_title_ratings()
+    for model in (Title, Review, Comment):
+        rebuild_search_index(model)
+
+
+def get_endpoints(titles):
+    """Маршруты из api/urls.py с параметрами для синтетических данных."""
+    title = 1
+    review = Review.objects.filter(title=title).values_list(
+        'pk', flat=True
+    ).first() or 1
+    return {
+        'categories-list': '/api/v1/categories/',
+        'genres-list': '/api/v1/genres/',
+        'titles-list': '/api/v1/titles/',
+        'titles-list-filtered': '/api/v1/titles/?genre=genre1&year=1950',
+        'titles-list-deep-page': (
+            f'/api/v1/titles/?page={max(titles // 100, 1)}'
+        ),
+        'titles-search': '/api/v1/titles/?search=произведение',
+        'titles-detail': f'/api/v1/titles/{title}/',
+        'reviews-list': f'/api/v1/titles/{title}/reviews/',
+        'reviews-list-cursor': (
+            f'/api/v1/titles/{title}/reviews/?pagination=cursor'
+        ),
+        'reviews-detail': f'/api/v1/titles/{title}/reviews/{review}/',
+        'comments-list': (
+            f'/api/v1/titles/{title}/reviews/{review}/comments/'
+        ),
+    }
+
+
+class QueryCounter:
+    """execute_wrapper, считающий запросы к базе."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(client, url, requests, warmup=0, **extra):
+    """Прогоняет GET-запросы к url и считает перцентили задержки."""
+    for _ in range(warmup):
+        client.get(url, **extra)
+    latencies = []
+    queries = []
+    statuses = set()
+    started = perf_counter()
+    for _ in range(requests):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            request_started = perf_counter()
+            response = client.get(url, **extra)
+            latencies.append(perf_counter() - request_started)
+        queries.append(counter.count)
+        statuses.add(response.status_code)
+    elapsed = perf_counter() - started
+    latencies.sort()
+    return {
+        'url': url,
+        'requests': requests,
+        'statuses': sorted(statuses),
+        'p50_ms': round(quantile(latencies, 0.5) * 1000, 3),
+        'p95_ms': round(quantile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(quantile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(mean(latencies) * 1000, 3),
+        'queries_per_request': round(mean(queries), 2),
+        'throughput_rps': round(requests / elapsed, 1),
+    }
+
+
+def post_reviews(user, title_ids):
+    """
+    Отправляет отзывы пользователя к произведениям по очереди.
+
+    Выполняется в отдельном потоке со своим подключением к базе.
+    Ошибка блокировки базы считается отдельным статусом, а не падением.
+    """
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    latencies = []
+    statuses = Counter()
+    try:
+        for title_id in title_ids:
+            started = perf_counter()
+            try:
+                status = client.post(
+                    f'/api/v1/titles/{title_id}/reviews/',
+                    data={'text': f'Отзыв {user.pk}', 'score': 5}
+                ).status_code
+            except OperationalError as error:
+                status = str(error)
+            latencies.append(perf_counter() - started)
+            statuses[status] += 1
+    finally:
+        connections.close_all()
+    return latencies, statuses
+
+
+def measure_writes(workers, requests):
+    """
+    Параллельные POST отзывов от workers пользователей.
+
+    Каждый пользователь пишет requests отзывов к разным произведениям,
+    поэтому все запросы корректны и различаются только конкуренцией
+    за запись в базу.
+    """
+    users = list(User.objects.order_by('pk')[:workers])
+    title_ids = list(
+        Title.objects.order_by('pk').values_list('pk', flat=True)[:requests]
+    )
+    connection.close()
+    latencies = []
+    statuses = Counter()
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for worker_latencies, worker_statuses in executor.map(
+            post_reviews, users, [title_ids] * len(users)
+        ):
+            latencies.extend(worker_latencies)
+            statuses.update(worker_statuses)
+    elapsed = perf_counter() - started
+    latencies.sort()
+    return {
+        'workers': len(users),
+        'requests': len(latencies),
+        'statuses': {str(status): count for status, count in statuses.items()},
+        'created': statuses[201],
+        'p50_ms': round(quantile(latencies, 0.5) * 1000, 3),
+        'p95_ms': round(quantile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(quantile(latencies, 0.99) * 1000, 3),
+        'throughput_rps': round(statuses[201] / elapsed, 1),
+    }
+
+
+class DatabaseLatency:
+    """
+    execute_wrapper, добавляющий задержку к каждому запросу к базе.
+
+    Имитирует сетевую базу (например, PostgreSQL на другом сервере)
+    при замерах на локальной SQLite.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        sleep(self.seconds)
+        return execute(sql, params, many, context)
+
+    def install(self, sender, connection, **kwargs):
+        """Обработчик connection_created."""
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+
+def latency_report(latencies, statuses, elapsed):
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'statuses': {str(status): count for status, count in statuses.items()},
+        'p50_ms': round(quantile(latencies, 0.5) * 1000, 3),
+        'p95_ms': round(quantile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(quantile(latencies, 0.99) * 1000, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+    }
+
+
+def wsgi_worker(urls, requests):
+    """Поток WSGI-сервера: запросы по очереди через тестовый клиент."""
+    client = Client()
+    latencies = []
+    statuses = Counter()
+    try:
+        for number in range(requests):
+            started = perf_counter()
+            response = client.get(urls[number % len(urls)])
+            latencies.append(perf_counter() - started)
+            statuses[response.status_code] += 1
+    finally:
+        connections.close_all()
+    return latencies, statuses
+
+
+def measure_wsgi(urls, concurrency, requests):
+    """concurrency потоков, как у многопоточного WSGI-сервера."""
+    latencies = []
+    statuses = Counter()
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for worker_latencies, worker_statuses in executor.map(
+            wsgi_worker, [urls] * concurrency, [requests] * concurrency
+        ):
+            latencies.extend(worker_latencies)
+            statuses.update(worker_statuses)
+    return latency_report(latencies, statuses, perf_counter() - started)
+
+
+async def asgi_get(application, url):
+    """GET-запрос к ASGI-приложению без сети, возвращает статус ответа."""
+    path, _, query = url.partition('?')
+    communicator = ApplicationCommunicator(application, {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    })
+    await communicator.send_input({'type': 'http.request', 'body': b''})
+    start = await communicator.receive_output(ASGI_TIMEOUT)
+    more_body = True
+    while more_body:
+        message = await communicator.receive_output(ASGI_TIMEOUT)
+        more_body = message.get('more_body', False)
+    await communicator.wait(ASGI_TIMEOUT)
+    return start['status']
+
+
+async def asgi_worker(application, urls, requests, latencies, statuses):
+    for number in range(requests):
+        started = perf_counter()
+        status = await asgi_get(application, urls[number % len(urls)])
+        latencies.append(perf_counter() - started)
+        statuses[status] += 1
+
+
+def measure_asgi(application, urls, concurrency, requests):
+    """concurrency одновременных клиентов в одном цикле событий."""
+    latencies = []
+    statuses = Counter()
+
+    async def run():
+        await asyncio.gather(*(
+            asgi_worker(application, urls, requests, latencies, statuses)
+            for _ in range(concurrency)
+        ))
+
+    started = perf_counter()
+    asyncio.run(run())
+    return latency_report(latencies, statuses, perf_counter() - started)
+
+
+def sample_pages(page_size):
+    """Страницы произведений и отзывов в том виде, как их отдает API."""
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('pk')[:page_size]
+    reviews = Review.objects.select_related('author').order_by('pk')[
+        :page_size
+    ]
+    return {
+        name: {
+            'count': len(results),
+            'next': f'http://testserver/api/v1/{name}/?page=2',
+            'previous': None,
+            'results': results,
+        }
+        for name, results in (
+            ('titles', TitleSerializer(titles, many=True).data),
+            ('reviews', ReviewSerializer(reviews, many=True).data),
+        )
+    }
+
+
+def measure_render(renderer, data, repeat):
+    """Время рендеринга одной страницы renderer.render."""
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        content = renderer.render(data, 'application/json')
+        timings.append(perf_counter() - started)
+    timings.sort()
+    return {
+        'bytes': len(content),
+        'p50_us': round(quantile(timings, 0.5) * 10 ** 6, 1),
+        'p95_us': round(quantile(timings, 0.95) * 10 ** 6, 1),
+        'mean_us': round(mean(timings) * 10 ** 6, 1),
+        'mb_per_s': round(len(content) / mean(timings) / 10 ** 6, 1),
+    }
@@ -0,0 +1,58 @@
+from csv import DictReader
+from itertools import islice
+from multiprocessing import get_context
+
+PREFETCH_BATCHES: int = 2
+# load_data вызывает prefetch_batches из потоков пула, пока другие потоки
+# держат подключения к базе и блокировки. fork из такого процесса может
+# зависнуть, дочернему процессу нужен только разбор csv, поэтому spawn.
+START_METHOD: str = 'spawn'
+
+
+def read_batches(path, batch_size):
+    """Построчно читает csv и отдает строки пачками по batch_size."""
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = DictReader(f)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            yield batch
+
+
+def _produce_batches(path, batch_size, queue):
+    try:
+        for batch in read_batches(path, batch_size):
+            queue.put(batch)
+    except Exception as error:
+        queue.put(error)
+    finally:
+        queue.put(None)
+
+
+def prefetch_batches(path, batch_size):
+    """
+    Разбирает csv в отдельном процессе, пока текущая пачка пишется в базу.
+
+    Очередь ограничена PREFETCH_BATCHES пачками, поэтому расход памяти
+    не зависит от размера файла.
+    """
+    context = get_context(START_METHOD)
+    queue = context.Queue(maxsize=PREFETCH_BATCHES)
+    process = context.Process(
+        target=_produce_batches,
+        args=(str(path), batch_size, queue),
+        daemon=True
+    )
+    process.start()
+    try:
+        while True:
+            batch = queue.get()
+            if batch is None:
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+    finally:
+        process.terminate()
+        process.join()
@@ -0,0 +1,119 @@
+import json
+import subprocess
+from datetime import datetime, timezone
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases
+
+from app.benchmark import get_endpoints, measure, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет отдельную тестовую базу синтетическими данными и замеряет '
+        'задержку, запросы к базе и пропускную способность эндпоинтов API.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=1000)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Сколько запросов делать к каждому эндпоинту.'
+        )
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            dest='endpoints',
+            help='Замерить только указанный эндпоинт (можно повторять).'
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Отключить кеш ответов каталога на время замеров.'
+        )
+        parser.add_argument(
+            '--output',
+            default='benchmark.json',
+            help='Файл для результатов в JSON.'
+        )
+
+    @staticmethod
+    def get_revision():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def run_endpoints(self, options):
+        endpoints = get_endpoints(options['titles'])
+        selected = options['endpoints'] or list(endpoints)
+        client = Client()
+        results = {}
+        for name in selected:
+            results[name] = measure(
+                client, endpoints[name], options['requests'],
+                options['warmup']
+            )
+            self.stdout.write(
+                f'{name:24} p50={results[name]["p50_ms"]:8.2f}ms '
+                f'p95={results[name]["p95_ms"]:8.2f}ms '
+                f'p99={results[name]["p99_ms"]:8.2f}ms '
+                f'q={results[name]["queries_per_request"]:5} '
+                f'{results[name]["throughput_rps"]:8.1f} rps'
+            )
+        return results
+
+    def handle(self, *args, **options):
+        """Создает тестовую базу, заполняет ее и прогоняет замеры."""
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            started = datetime.now(timezone.utc)
+            seed(
+                options['users'], options['titles'],
+                options['reviews'], options['comments']
+            )
+            seeded = datetime.now(timezone.utc) - started
+            self.stdout.write(
+                f'Данные созданы за {seeded.total_seconds():.1f}с'
+            )
+            if options['no_cache']:
+                dummy = {
+                    'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+                }
+                with override_settings(
+                    CACHES={'default': dummy, 'api': dummy}
+                ):
+                    results = self.run_endpoints(options)
+            else:
+                results = self.run_endpoints(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+        report = {
+            'revision': self.get_revision(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'scale': {
+                name: options[name]
+                for name in ('users', 'titles', 'reviews', 'comments')
+            },
+            'cache': not options['no_cache'],
+            'endpoints': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
@@ -0,0 +1,133 @@
+import json
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.test.utils import setup_databases, teardown_databases
+
+from app.benchmark import (DatabaseLatency, get_endpoints, measure_asgi,
+                           measure_wsgi, seed)
+
+ENDPOINTS: tuple = (
+    'titles-list', 'titles-detail', 'reviews-list', 'comments-list'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность чтения под WSGI, под ASGI '
+        'с синхронными view и под ASGI с асинхронным чтением.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=1000)
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=32,
+            help='Сколько клиентов отправляют запросы одновременно.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help='Сколько запросов отправляет каждый клиент.'
+        )
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            dest='endpoints',
+            help='Эндпоинт из benchmark (можно повторять).'
+        )
+        parser.add_argument(
+            '--db-latency',
+            type=float,
+            default=0,
+            help='Задержка каждого запроса к базе в мс, имитация сетевой базы.'
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Отключить кеш ответов каталога на время замеров.'
+        )
+        parser.add_argument(
+            '--output',
+            default='benchmark_asgi.json',
+            help='Файл для результатов в JSON.'
+        )
+
+    def run_modes(self, urls, options):
+        from api_yamdb.asgi import AsyncReadsHandler
+
+        modes = {
+            'wsgi': lambda: measure_wsgi(
+                urls, options['concurrency'], options['requests']
+            ),
+            'asgi': lambda: measure_asgi(
+                ASGIHandler(), urls,
+                options['concurrency'], options['requests']
+            ),
+            'asgi-async-reads': lambda: measure_asgi(
+                AsyncReadsHandler(), urls,
+                options['concurrency'], options['requests']
+            ),
+        }
+        results = {}
+        for mode, run in modes.items():
+            results[mode] = result = run()
+            self.stdout.write(
+                f'{mode:18} p50={result["p50_ms"]:8.2f}ms '
+                f'p95={result["p95_ms"]:8.2f}ms '
+                f'p99={result["p99_ms"]:8.2f}ms '
+                f'{result["throughput_rps"]:8.1f} rps '
+                f'{result["statuses"]}'
+            )
+        return results
+
+    def handle(self, *args, **options):
+        """Создает тестовую базу и прогоняет одни и те же запросы."""
+        # Задержка добавляется только к новым подключениям: запросы
+        # к API идут из потоков серверов, заполнение базы - без нее.
+        latency = DatabaseLatency(options['db_latency'] / 1000)
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            seed(
+                options['users'], options['titles'],
+                options['reviews'], options['comments']
+            )
+            endpoints = get_endpoints(options['titles'])
+            urls = [
+                endpoints[name] for name in options['endpoints'] or ENDPOINTS
+            ]
+            if options['db_latency']:
+                connection_created.connect(latency.install)
+            if options['no_cache']:
+                dummy = {
+                    'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+                }
+                with override_settings(
+                    CACHES={'default': dummy, 'api': dummy}
+                ):
+                    results = self.run_modes(urls, options)
+            else:
+                results = self.run_modes(urls, options)
+        finally:
+            connection_created.disconnect(latency.install)
+            teardown_databases(old_config, verbosity=0)
+        report = {
+            'concurrency': options['concurrency'],
+            'db_latency_ms': options['db_latency'],
+            'requests': options['requests'],
+            'cache': not options['no_cache'],
+            'urls': urls,
+            'modes': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
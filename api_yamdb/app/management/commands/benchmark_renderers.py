@@ -0,0 +1,78 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer, orjson
+from app.benchmark import measure_render, sample_pages, seed
+
+RENDERERS: dict = {
+    'drf': JSONRenderer,
+    'fast': FastJSONRenderer,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает JSONRenderer и FastJSONRenderer на страницах '
+        'произведений и отзывов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=100,
+            help='Сколько объектов на странице.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=500,
+            help='Сколько раз рендерить каждую страницу.'
+        )
+        parser.add_argument(
+            '--output',
+            default='benchmark_renderers.json',
+            help='Файл для результатов в JSON.'
+        )
+
+    def handle(self, *args, **options):
+        """Рендерит одни и те же страницы обоими рендерерами."""
+        page_size = options['page_size']
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            seed(page_size, page_size, page_size, 0)
+            pages = sample_pages(page_size)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+        results = {}
+        for page, data in pages.items():
+            rendered = {
+                name: renderer().render(data, 'application/json')
+                for name, renderer in RENDERERS.items()
+            }
+            if json.loads(rendered['drf']) != json.loads(rendered['fast']):
+                raise CommandError(f'{page}: рендереры отдают разный JSON.')
+            results[page] = {
+                name: measure_render(renderer(), data, options['repeat'])
+                for name, renderer in RENDERERS.items()
+            }
+            drf, fast = results[page]['drf'], results[page]['fast']
+            self.stdout.write(
+                f'{page:8} {drf["bytes"]:7} байт  '
+                f'drf p50={drf["p50_us"]:8.1f}мкс  '
+                f'fast p50={fast["p50_us"]:8.1f}мкс  '
+                f'x{drf["mean_us"] / fast["mean_us"]:.1f}'
+            )
+        report = {
+            'orjson': orjson.__version__ if orjson else None,
+            'page_size': page_size,
+            'pages': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
@@ -0,0 +1,101 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import setup_databases, teardown_databases
+
+from app.benchmark import measure_writes, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет параллельные POST отзывов на файловой базе SQLite '
+        'с разными профилями SQLITE_PROFILES.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Сколько пользователей пишут отзывы одновременно.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Сколько отзывов пишет каждый пользователь.'
+        )
+        parser.add_argument(
+            '--profile',
+            action='append',
+            dest='profiles',
+            help='Профиль из SQLITE_PROFILES (можно повторять). '
+                 'По умолчанию все.'
+        )
+        parser.add_argument(
+            '--output',
+            default='benchmark_writes.json',
+            help='Файл для результатов в JSON.'
+        )
+
+    def run_profile(self, profile, options):
+        """
+        Замер одного профиля на новой файловой базе.
+
+        In-memory база из тестовых настроек не подходит: WAL и блокировки
+        работают только с файлом.
+        """
+        test_settings = connection.settings_dict['TEST']
+        old_name = test_settings['NAME']
+        with TemporaryDirectory() as directory:
+            test_settings['NAME'] = str(Path(directory) / 'benchmark.sqlite3')
+            try:
+                with override_settings(SQLITE_PROFILE=profile):
+                    old_config = setup_databases(
+                        verbosity=0, interactive=False
+                    )
+                    try:
+                        seed(options['workers'], options['requests'], 0, 0)
+                        with connection.cursor() as cursor:
+                            cursor.execute('PRAGMA journal_mode')
+                            journal_mode = cursor.fetchone()[0]
+                        result = measure_writes(
+                            options['workers'], options['requests']
+                        )
+                    finally:
+                        teardown_databases(old_config, verbosity=0)
+            finally:
+                test_settings['NAME'] = old_name
+        result['journal_mode'] = journal_mode
+        return result
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Замер предназначен для SQLite.')
+        profiles = options['profiles'] or list(settings.SQLITE_PROFILES)
+        results = {}
+        for profile in profiles:
+            results[profile] = result = self.run_profile(profile, options)
+            self.stdout.write(
+                f'{profile:12} {result["journal_mode"]:8} '
+                f'создано {result["created"]}/{result["requests"]} '
+                f'p50={result["p50_ms"]:8.2f}ms '
+                f'p95={result["p95_ms"]:8.2f}ms '
+                f'{result["throughput_rps"]:8.1f} rps'
+            )
+            errors = {
+                status: count for status, count in result['statuses'].items()
+                if status != '201'
+            }
+            if errors:
+                self.stdout.write(self.style.WARNING(f'  ошибки: {errors}'))
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
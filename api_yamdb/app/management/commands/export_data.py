@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.export import CHUNK_SIZE, CONTENT_TYPES, EXPORTS, export_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает таблицы в csv или ndjson с колонками static/data/*.csv.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help=f'Что выгрузить: {", ".join(EXPORTS)}. По умолчанию все.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=tuple(CONTENT_TYPES),
+            default='csv',
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '--dir',
+            default='.',
+            help='Каталог для файлов выгрузки.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Сколько строк читать из базы за раз.'
+        )
+
+    def handle(self, *args, **options):
+        """Каждая таблица пишется в файл <имя>.<формат> по частям."""
+        names = options['names'] or tuple(EXPORTS)
+        unknown = set(names) - set(EXPORTS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные выгрузки: {", ".join(sorted(unknown))}'
+            )
+        directory = Path(options['dir'])
+        directory.mkdir(parents=True, exist_ok=True)
+        file_format = options['format']
+        for name in names:
+            path = directory / f'{name}.{file_format}'
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                for chunk in export_chunks(
+                    name, file_format, options['chunk_size']
+                ):
+                    f.write(chunk)
+            self.stdout.write(f'{name}: {path}')
@@ -1,10 +1,22 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from csv import DictReader
+from graphlib import TopologicalSorter
+from time import monotonic
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import connections, transaction
 
+from api.cache import ALL_DATA, bump_version
+from app.functions import prefetch_batches
+from reviews.functions import rebuild_title_ratings
 from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.search import rebuild_search_index
 from users.models import User
 
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+BATCH_SIZE: int = 1000
+
 FILE_DATA_TO_MODEL: dict = {
     'users.csv': User,
     'category.csv': Category,
@@ -16,34 +28,145 @@ FILE_DATA_TO_MODEL: dict = {
 }
 
 
+def build_dependency_graph(file_to_model):
+    """
+    Граф зависимостей файлов по внешним ключам моделей.
+
+    Файл можно загружать, когда загружены все файлы моделей,
+    на которые ссылаются его ForeignKey.
+    """
+    model_to_file = {model: file for file, model in file_to_model.items()}
+    return TopologicalSorter({
+        file: {
+            model_to_file[field.related_model]
+            for field in model._meta.concrete_fields
+            if field.many_to_one and field.related_model in model_to_file
+        }
+        for file, model in file_to_model.items()
+    })
+
+
 class Command(BaseCommand):
+    help = 'Загружает данные из static/data/*.csv в базу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк в одной транзакции.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Сколько независимых файлов загружать одновременно.'
+        )
+
+    @staticmethod
+    def get_columns(model, header):
+        """
+        Сопоставляет колонки csv с полями модели.
+
+        Для внешних ключей возвращается поле модели, на которую они ссылаются,
+        чтобы проверить значение по карте id.
+        """
+        columns = {}
+        for column in header:
+            field = model._meta.get_field(column)
+            columns[column] = (
+                field.attname,
+                field.related_model if field.is_relation else None
+            )
+        return columns
 
     @staticmethod
-    def write_data_to_model(file, model):
+    def build_id_maps(columns):
+        """Один раз на файл загружает id всех связанных объектов."""
+        return {
+            related: {
+                str(pk) for pk in related.objects.values_list('pk', flat=True)
+            }
+            for _, related in columns.values() if related is not None
+        }
+
+    def write_data_to_model(self, file, model, batch_size):
         """
         Запись файла в соответствующую модель.
 
-        В некоторых случаях достаются объекты моделей и записываются в базу
+        Файл читается пачками, каждая пачка записывается bulk_create
+        в отдельной транзакции. Строки со ссылками на несуществующие
+        объекты пропускаются.
         """
-        with open(f'static/data/{file}', encoding='utf-8') as f:
-            rows = DictReader(f)
-            for row in rows:
-                if model == Title:
-                    category_obj = Category.objects.get(pk=row['category'])
-                    del row['category']
-                    model.objects.get_or_create(**row, category=category_obj)
-                elif model == Review or model == Comment:
-                    author_obj = User.objects.get(pk=row['author'])
-                    del row['author']
-                    model.objects.get_or_create(**row, author=author_obj)
-                else:
-                    model.objects.get_or_create(**row)
+        path = DATA_DIR / file
+        with open(path, encoding='utf-8', newline='') as f:
+            columns = self.get_columns(model, DictReader(f).fieldnames)
+        id_maps = self.build_id_maps(columns)
+        read = skipped = 0
+        existing = model.objects.count()
+        started = monotonic()
+        for batch in prefetch_batches(path, batch_size):
+            objs = []
+            for row in batch:
+                if any(
+                    related is not None and row[column]
+                    and row[column] not in id_maps[related]
+                    for column, (_, related) in columns.items()
+                ):
+                    skipped += 1
+                    continue
+                objs.append(model(**{
+                    attname: row[column] or None if related else row[column]
+                    for column, (attname, related) in columns.items()
+                }))
+            with transaction.atomic():
+                model.objects.bulk_create(objs, ignore_conflicts=True)
+            read += len(objs)
+        elapsed = monotonic() - started
+        # ignore_conflicts молча отбрасывает строки с уже занятыми
+        # ключами, поэтому записанные строки считаются по таблице.
+        loaded = model.objects.count() - existing
+        self.stdout.write(
+            f'{file}: {loaded} строк, пропущено {skipped}, '
+            f'уже были в базе {read - loaded}, '
+            f'{loaded / elapsed if elapsed else loaded:.0f} строк/с'
+        )
+
+    def load_file(self, file, batch_size):
+        """Загрузка файла в потоке пула со своим подключением к базе."""
+        try:
+            self.write_data_to_model(
+                file, FILE_DATA_TO_MODEL[file], batch_size
+            )
+        finally:
+            connections.close_all()
 
     def handle(self, *args, **options):
         """
         Инициализируящая функция.
 
-        Запись файла .csv в соответсвующую модель.
+        Запись файлов .csv в соответсвующие модели. Файлы, которые
+        не зависят друг от друга, загружаются параллельно.
         """
-        for file, model in FILE_DATA_TO_MODEL.items():
-            self.write_data_to_model(file, model)
+        graph = build_dependency_graph(FILE_DATA_TO_MODEL)
+        graph.prepare()
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            running = {}
+            while graph.is_active():
+                for file in graph.get_ready():
+                    future = executor.submit(
+                        self.load_file, file, options['batch_size']
+                    )
+                    running[future] = file
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                    graph.done(running.pop(future))
+        # bulk_create не вызывает сигналы, поэтому рейтинг и поисковый
+        # индекс пересчитываются после загрузки.
+        rebuild_title_ratings()
+        for model in (Title, Review, Comment):
+            rebuild_search_index(model)
+        # Кеш ответов и ETag зависят от версий данных, а bulk_create
+        # их не меняет: после загрузки меняются версии всех наборов.
+        bump_version(ALL_DATA)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.functions import rebuild_title_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохраненный рейтинг произведений по отзывам.'
+
+    def handle(self, *args, **options):
+        """Полный пересчет rating, review_count и score_sum."""
+        with transaction.atomic():
+            rated = rebuild_title_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Рейтинг пересчитан, с отзывами: {rated}')
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Comment, Review, Title
+from reviews.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс произведений и отзывов.'
+
+    def handle(self, *args, **options):
+        """Заполняет поисковые таблицы заново по текущим данным."""
+        for model in (Title, Review, Comment):
+            with transaction.atomic():
+                count = rebuild_search_index(model)
+            self.stdout.write(f'{model._meta.model_name}: {count}')
@@ -0,0 +1,42 @@
+from time import sleep
+
+from django.core.management.base import BaseCommand
+
+from users.const import EMAIL_BATCH_SIZE
+from users.functions import deliver_emails
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди OutgoingEmail.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EMAIL_BATCH_SIZE,
+            help='Сколько писем отправлять за одно SMTP-подключение.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить одну пачку и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        """Обрабатывает очередь, пока команду не остановят."""
+        while True:
+            sent, failed = deliver_emails(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, с ошибкой: {failed}'
+                )
+            if options['once']:
+                return
+            if not sent and not failed:
+                sleep(options['interval'])
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+
+def apply_sqlite_profile(sender, connection, **kwargs):
+    """PRAGMA из профиля settings.SQLITE_PROFILE для нового подключения."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = settings.SQLITE_PROFILES[settings.SQLITE_PROFILE]
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -9,6 +9,7 @@ class TitleAdmin(admin.ModelAdmin):
         'year',
         'description',
         'category',
+        'rating',
     )
     list_editable = ('name', 'year', 'description', 'category')
     search_fields = ('pk', 'name', 'year', 'description', 'category')
@@ -1 +1,4 @@
 MAX_TEXT_LEN: int = 25
+MIN_SCORE: int = 1
+MAX_SCORE: int = 10
+SCORES: range = range(MIN_SCORE, MAX_SCORE + 1)
@@ -0,0 +1,82 @@
+import csv
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from users.models import User
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+
+CHUNK_SIZE: int = 2000
+
+# Выгрузки по имени файла из static/data: модель и колонки.
+# Колонки повторяют static/data/*.csv, поэтому выгрузку можно
+# загрузить обратно командой load_data.
+EXPORTS: dict = {
+    'users': (User, (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    )),
+    'category': (Category, ('id', 'name', 'slug')),
+    'genre': (Genre, ('id', 'name', 'slug')),
+    'titles': (Title, ('id', 'name', 'year', 'category', 'description')),
+    'genre_title': (GenreTitle, ('id', 'title_id', 'genre_id')),
+    'review': (Review, (
+        'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+    )),
+    'comments': (Comment, ('id', 'review_id', 'text', 'author', 'pub_date')),
+}
+
+CONTENT_TYPES: dict = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+
+class Echo:
+    """Псевдофайл для csv.writer: writerow возвращает строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(name, chunk_size=CHUNK_SIZE):
+    """
+    Строки таблицы без создания объектов моделей.
+
+    iterator читает курсор порциями по chunk_size, поэтому память
+    не растет с размером таблицы.
+    """
+    model, columns = EXPORTS[name]
+    return model.objects.order_by('pk').values_list(*columns).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def format_value(value):
+    """Значение для csv в том же виде, что и в static/data."""
+    if value is None or isinstance(value, (str, int)):
+        return value
+    return encoder.default(value)
+
+
+def export_chunks(name, file_format, chunk_size=CHUNK_SIZE):
+    """Текст выгрузки в формате csv или ndjson кусками по chunk_size строк."""
+    _, columns = EXPORTS[name]
+    rows = export_rows(name, chunk_size)
+    if file_format == 'ndjson':
+        lines = (
+            encoder.encode(dict(zip(columns, row))) + '\n' for row in rows
+        )
+    else:
+        writer = csv.writer(Echo())
+        yield writer.writerow(columns)
+        lines = (
+            writer.writerow([format_value(value) for value in row])
+            for row in rows
+        )
+    while True:
+        chunk = ''.join(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
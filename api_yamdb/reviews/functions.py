@@ -0,0 +1,101 @@
+from django.db import connections, transaction
+from django.db.models import (Case, Count, F, FloatField, IntegerField,
+                              OuterRef, Subquery, Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce
+
+from .const import SCORES
+from .models import Review, Title
+from .search import index_objects
+
+
+def update_title_rating(title_id, added_score=None,
+                        removed_score=None) -> None:
+    """
+    Инкрементально обновляет рейтинг и гистограмму оценок произведения.
+
+    added_score - оценка нового отзыва или новая оценка измененного,
+    removed_score - оценка удаленного отзыва или прежняя оценка.
+    Обновление выполняется одним UPDATE через F-выражения, поэтому
+    параллельные отзывы не затирают друг друга.
+    """
+    count_delta = (added_score is not None) - (removed_score is not None)
+    new_count = F('review_count') + count_delta
+    new_sum = F('score_sum') + (added_score or 0) - (removed_score or 0)
+    histogram = {}
+    if added_score is not None:
+        histogram[f'score_{added_score}'] = F(f'score_{added_score}') + 1
+    if removed_score is not None:
+        histogram[f'score_{removed_score}'] = (
+            histogram.get(f'score_{removed_score}')
+            or F(f'score_{removed_score}')
+        ) - 1
+    Title.objects.filter(pk=title_id).update(
+        review_count=new_count,
+        score_sum=new_sum,
+        rating=Case(
+            When(review_count=-count_delta, then=Value(None)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField(),
+        ),
+        **histogram
+    )
+
+
+def rebuild_title_ratings() -> int:
+    """Пересчитывает рейтинг и гистограммы оценок по таблице отзывов."""
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    review_count = Coalesce(
+        Subquery(reviews.annotate(c=Count('pk')).values('c')),
+        0,
+        output_field=IntegerField(),
+    )
+    score_sum = Coalesce(
+        Subquery(reviews.annotate(s=Sum('score')).values('s')),
+        0,
+        output_field=IntegerField(),
+    )
+    histogram = {
+        f'score_{score}': Coalesce(
+            Subquery(reviews.filter(score=score).annotate(
+                c=Count('pk')
+            ).values('c')),
+            0,
+            output_field=IntegerField(),
+        )
+        for score in SCORES
+    }
+    Title.objects.update(
+        review_count=review_count, score_sum=score_sum, **histogram
+    )
+    Title.objects.filter(review_count=0).update(rating=None)
+    return Title.objects.filter(review_count__gt=0).update(
+        rating=Cast(F('score_sum'), FloatField()) / F('review_count')
+    )
+
+
+def save_titles(titles) -> None:
+    """
+    Сохраняет список новых произведений одним bulk_create.
+
+    Если база не возвращает id из bulk_create (SQLite в Django 3.2),
+    id перечитываются в той же транзакции: SQLite пускает одного
+    писателя, а id с AUTOINCREMENT растут, поэтому новые строки -
+    последние len(titles) по id. Сигналы post_save не отправляются:
+    поисковый индекс пополняется одним запросом на весь список,
+    версию каталога меняет вызывающий код.
+    """
+    if not titles:
+        return
+    using = Title.objects.db
+    features = connections[using].features
+    with transaction.atomic(using=using):
+        Title.objects.bulk_create(titles)
+        if not features.can_return_rows_from_bulk_insert:
+            pks = list(Title.objects.using(using).order_by('-pk').values_list(
+                'pk', flat=True
+            )[:len(titles)])
+            for title, pk in zip(titles, reversed(pks)):
+                title.pk = pk
+        index_objects(Title, titles)
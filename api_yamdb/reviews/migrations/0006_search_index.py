@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# Поисковые таблицы FTS5 на момент миграции: модель, таблица и поля.
+# DDL записан здесь, а не берется из reviews.search, чтобы изменения
+# кода поиска не меняли уже примененную миграцию.
+SEARCH_TABLES = {
+    'title': ('reviews_title_fts', ('name', 'description')),
+    'review': ('reviews_review_fts', ('text',)),
+    'comment': ('reviews_comment_fts', ('text',)),
+}
+
+
+def create_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for model_name, (table, fields) in SEARCH_TABLES.items():
+        model = apps.get_model('reviews', model_name)
+        columns = ', '.join(fields)
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {table} '
+            f'USING fts5({columns}, tokenize=\'unicode61\')'
+        )
+        schema_editor.execute(
+            f'INSERT INTO {table} (rowid, {columns}) '
+            f'SELECT id, {columns} FROM {model._meta.db_table}'
+        )
+
+
+def drop_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, _ in SEARCH_TABLES.values():
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_pub_date_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_tables, drop_tables),
+    ]
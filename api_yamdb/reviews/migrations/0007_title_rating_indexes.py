@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(('rating__isnull', False)), fields=['-rating', 'id'], name='title_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(('rating__isnull', False)), fields=['category', '-rating', 'id'], name='title_category_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import migrations
+
+# GIN-индексы полнотекстового поиска на PostgreSQL: таблица, имя индекса
+# и выражение. Выражение совпадает с SearchVector(..., config='simple')
+# из reviews.search.search(), иначе планировщик не использует индекс.
+SEARCH_INDEXES = (
+    (
+        'reviews_title', 'reviews_title_search_idx',
+        "to_tsvector('simple'::regconfig, "
+        "COALESCE(name, '') || ' ' || COALESCE(description, ''))",
+    ),
+    (
+        'reviews_review', 'reviews_review_search_idx',
+        "to_tsvector('simple'::regconfig, COALESCE(text, ''))",
+    ),
+    (
+        'reviews_comment', 'reviews_comment_search_idx',
+        "to_tsvector('simple'::regconfig, COALESCE(text, ''))",
+    ),
+)
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, name, expression in SEARCH_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} '
+            f'ON {table} USING GIN ({expression})'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for _, name, _ in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_data_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -1,11 +1,50 @@
+from contextlib import contextmanager
+from math import ceil
+from threading import local
+
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
-from .const import MAX_TEXT_LEN
+from .const import MAX_SCORE, MAX_TEXT_LEN, MIN_SCORE, SCORES
 
 User = get_user_model()
 
+_cascade = local()
+
+
+@contextmanager
+def cascade_delete(instance):
+    """
+    Удаление объекта вместе со связанными объектами.
+
+    Пока оно идет, обработчики удаления связанных объектов
+    (reviews.signals, api.cache) видят родителя в is_deleting()
+    и пропускают работу, которую один раз делает обработчик
+    удаления родителя. Отметки снимаются в конце удаления,
+    в том числе при ошибке.
+    """
+    owner = getattr(_cascade, 'deleting', None) is None
+    if owner:
+        _cascade.deleting = set()
+    mark_deleting(instance)
+    try:
+        yield
+    finally:
+        if owner:
+            _cascade.deleting = None
+
+
+def mark_deleting(instance) -> None:
+    """Отмечает объект, удаляемый внутри cascade_delete()."""
+    deleting = getattr(_cascade, 'deleting', None)
+    if deleting is not None:
+        deleting.add((type(instance), instance.pk))
+
+
+def is_deleting(model, pk) -> bool:
+    return (model, pk) in (getattr(_cascade, 'deleting', None) or ())
+
 
 class Category(models.Model):
     """Категории."""
@@ -50,13 +89,123 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         related_name='titles'
     )
+    rating = models.FloatField(
+        help_text='Средняя оценка',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        help_text='Количество отзывов',
+        default=0,
+        editable=False
+    )
+    score_sum = models.PositiveIntegerField(
+        help_text='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    # Гистограмма оценок: количество отзывов с каждой оценкой,
+    # обновляется вместе с рейтингом.
+    score_1 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 1',
+        default=0,
+        editable=False
+    )
+    score_2 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 2',
+        default=0,
+        editable=False
+    )
+    score_3 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 3',
+        default=0,
+        editable=False
+    )
+    score_4 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 4',
+        default=0,
+        editable=False
+    )
+    score_5 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 5',
+        default=0,
+        editable=False
+    )
+    score_6 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 6',
+        default=0,
+        editable=False
+    )
+    score_7 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 7',
+        default=0,
+        editable=False
+    )
+    score_8 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 8',
+        default=0,
+        editable=False
+    )
+    score_9 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 9',
+        default=0,
+        editable=False
+    )
+    score_10 = models.PositiveIntegerField(
+        help_text='Отзывов с оценкой 10',
+        default=0,
+        editable=False
+    )
 
     class Meta:
+        # Рейтинг по возрастанию для списка /titles/ (вместе
+        # с произведениями без отзывов) и по убыванию для /titles/top/:
+        # в частичные индексы произведения без отзывов не попадают,
+        # первые N строк читаются без сортировки.
+        indexes = [
+            models.Index(fields=['rating', 'id'], name='title_list_idx'),
+            models.Index(
+                fields=['-rating', 'id'],
+                name='title_rating_idx',
+                condition=models.Q(rating__isnull=False)
+            ),
+            models.Index(
+                fields=['category', '-rating', 'id'],
+                name='title_category_rating_idx',
+                condition=models.Q(rating__isnull=False)
+            ),
+        ]
         ordering = ['id']
 
     def __str__(self):
         return self.name[:MAX_TEXT_LEN]
 
+    def delete(self, *args, **kwargs):
+        with cascade_delete(self):
+            return super().delete(*args, **kwargs)
+
+    @property
+    def score_histogram(self) -> dict:
+        """Количество отзывов по каждой оценке."""
+        return {score: getattr(self, f'score_{score}') for score in SCORES}
+
+    def score_percentile(self, q: float):
+        """
+        Перцентиль оценок по гистограмме методом ближайшего ранга.
+
+        Считается по счетчикам score_1 ... score_10 без чтения отзывов,
+        для произведения без отзывов возвращает None.
+        """
+        histogram = self.score_histogram
+        rank = max(ceil(q * sum(histogram.values())), 1)
+        seen = 0
+        for score, count in histogram.items():
+            seen += count
+            if seen >= rank:
+                return score
+        return None
+
 
 class GenreTitle(models.Model):
     """Жанры/Произведения."""
@@ -85,8 +234,8 @@ class Review(models.Model):
     )
     score = models.PositiveSmallIntegerField(
         validators=[
-            MaxValueValidator(10),
-            MinValueValidator(1)
+            MaxValueValidator(MAX_SCORE),
+            MinValueValidator(MIN_SCORE)
         ],
         db_index=True
     )
@@ -97,11 +246,26 @@ class Review(models.Model):
                 fields=['author', 'title'],
                 name='unique_review')
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            )
+        ]
         ordering = ['pub_date']
 
     def __str__(self):
         return f'{self.text}, {self.score}'
 
+    def save(self, *args, **kwargs):
+        """Отзыв и рейтинг произведения сохраняются в одной транзакции."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with cascade_delete(self), transaction.atomic():
+            return super().delete(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Комментарии."""
@@ -115,7 +279,32 @@ class Comment(models.Model):
         'Дата добавления', auto_now_add=True, db_index=True)
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            )
+        ]
         ordering = ['pub_date']
 
     def __str__(self):
         return f'{self.author}, {self.pub_date}: {self.text}'
+
+
+class DataVersion(models.Model):
+    """
+    Версия набора данных для ключей кеша и ETag (api.cache).
+
+    Хранится в базе, а не в кеше: кеш api по умолчанию свой у каждого
+    процесса, и запись в одном процессе не меняла бы ETag в другом.
+    """
+
+    scope = models.CharField('Набор данных', max_length=64, primary_key=True)
+    version = models.BigIntegerField('Версия')
+
+    class Meta:
+        verbose_name = 'Версия данных'
+        verbose_name_plural = 'Версии данных'
+
+    def __str__(self):
+        return f'{self.scope}: {self.version}'
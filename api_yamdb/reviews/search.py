@@ -0,0 +1,136 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# Поисковые таблицы FTS5 по имени модели: таблица и индексируемые поля.
+# rowid строки в поисковой таблице совпадает с id объекта.
+SEARCH_TABLES: dict = {
+    'title': ('reviews_title_fts', ('name', 'description')),
+    'review': ('reviews_review_fts', ('text',)),
+    'comment': ('reviews_comment_fts', ('text',)),
+}
+# Конфигурация to_tsvector на PostgreSQL. Она указана явно: функция
+# с конфигурацией неизменяемая, поэтому по ней построен GIN-индекс
+# (миграция reviews 0010_search_gin_index).
+SEARCH_CONFIG: str = 'simple'
+
+
+def uses_fts(using=connection) -> bool:
+    return using.vendor == 'sqlite'
+
+
+def index_object(instance):
+    """Обновляет строку объекта в поисковой таблице."""
+    if not uses_fts():
+        return
+    table, fields = SEARCH_TABLES[instance._meta.model_name]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE rowid = %s', [instance.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {table} (rowid, {", ".join(fields)}) '
+            f'VALUES (%s{", %s" * len(fields)})',
+            [instance.pk, *(getattr(instance, field) for field in fields)]
+        )
+
+
+def index_objects(model, objects) -> None:
+    """Добавляет новые объекты модели в поисковую таблицу одним запросом."""
+    if not uses_fts() or not objects:
+        return
+    table, fields = SEARCH_TABLES[model._meta.model_name]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {table} (rowid, {", ".join(fields)}) '
+            f'VALUES (%s{", %s" * len(fields)})',
+            [
+                [obj.pk, *(getattr(obj, field) for field in fields)]
+                for obj in objects
+            ]
+        )
+
+
+def unindex_object(instance):
+    if not uses_fts():
+        return
+    table, _ = SEARCH_TABLES[instance._meta.model_name]
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE rowid = %s', [instance.pk])
+
+
+def unindex_queryset(queryset) -> None:
+    """Удаляет из поисковой таблицы строки объектов queryset одним запросом."""
+    if not uses_fts():
+        return
+    table, _ = SEARCH_TABLES[queryset.model._meta.model_name]
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE rowid IN ({sql})', params)
+
+
+def rebuild_search_index(model) -> int:
+    """Заполняет поисковую таблицу модели заново одним INSERT ... SELECT."""
+    if not uses_fts():
+        return 0
+    table, fields = SEARCH_TABLES[model._meta.model_name]
+    columns = ', '.join(fields)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table}')
+        cursor.execute(
+            f'INSERT INTO {table} (rowid, {columns}) '
+            f'SELECT id, {columns} FROM {model._meta.db_table}'
+        )
+        return cursor.rowcount
+
+
+def make_fts_query(query: str) -> str:
+    """
+    Безопасный запрос FTS5 из пользовательской строки.
+
+    Каждое слово ищется по префиксу, слова объединяются через AND,
+    операторы FTS5 из строки пользователя не интерпретируются.
+    """
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', query))
+
+
+def search(queryset, query: str):
+    """
+    Фильтрует queryset по полнотекстовому запросу.
+
+    Результаты сортируются по релевантности: на SQLite по bm25 из FTS5,
+    на PostgreSQL по ts_rank с GIN-индексом по выражению, на остальных
+    базах - поиск по вхождению.
+    """
+    model = queryset.model
+    table, fields = SEARCH_TABLES[model._meta.model_name]
+    if uses_fts():
+        fts_query = make_fts_query(query)
+        if not fts_query:
+            return queryset.none()
+        matches = f'FROM {table} WHERE {table} MATCH %s'
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid {matches}', [fts_query])
+        ).annotate(search_rank=RawSQL(
+            f'SELECT bm25({table}) {matches} '
+            f'AND rowid = {model._meta.db_table}.id',
+            [fts_query]
+        )).order_by('search_rank', 'pk')
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                    SearchVector)
+
+        vector = SearchVector(*fields, config=SEARCH_CONFIG)
+        search_query = SearchQuery(query, config=SEARCH_CONFIG)
+        return queryset.annotate(
+            search_vector=vector,
+            search_rank=SearchRank(vector, search_query)
+        ).filter(search_vector=search_query).order_by('-search_rank', 'pk')
+    condition = Q()
+    for word in query.split():
+        condition &= Q(*(
+            Q(**{f'{field}__icontains': word}) for field in fields
+        ), _connector=Q.OR)
+    return queryset.filter(condition)
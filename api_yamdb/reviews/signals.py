@@ -0,0 +1,76 @@
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .functions import update_title_rating
+from .models import Comment, Review, Title, is_deleting, mark_deleting
+from .search import index_object, unindex_object, unindex_queryset
+
+
+@receiver(pre_save, sender=Review)
+def remember_old_score(sender, instance, **kwargs):
+    """Запоминает прежнюю оценку, чтобы пересчитать рейтинг по разнице."""
+    instance._old_score = None
+    if instance.pk is not None:
+        instance._old_score = Review.objects.filter(
+            pk=instance.pk
+        ).values_list('score', flat=True).first()
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    old_score = getattr(instance, '_old_score', None)
+    if created or old_score is None:
+        update_title_rating(instance.title_id, added_score=instance.score)
+    elif old_score != instance.score:
+        update_title_rating(
+            instance.title_id,
+            added_score=instance.score,
+            removed_score=old_score
+        )
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    # Рейтинг удаляемого произведения пересчитывать незачем.
+    if not is_deleting(Title, instance.title_id):
+        update_title_rating(instance.title_id, removed_score=instance.score)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+def update_search_index(sender, instance, **kwargs):
+    index_object(instance)
+
+
+@receiver(pre_delete, sender=Title)
+def unindex_title_reviews(sender, instance, **kwargs):
+    """Отзывы и комментарии произведения уходят из индекса двумя запросами."""
+    unindex_queryset(Review.objects.filter(title=instance.pk))
+    unindex_queryset(Comment.objects.filter(review__title=instance.pk))
+
+
+@receiver(pre_delete, sender=Review)
+def unindex_review_comments(sender, instance, **kwargs):
+    if is_deleting(Title, instance.title_id):
+        mark_deleting(instance)
+        return
+    unindex_queryset(Comment.objects.filter(review=instance.pk))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def remove_from_search_index(sender, instance, **kwargs):
+    if not parent_is_deleting(instance):
+        unindex_object(instance)
+
+
+def parent_is_deleting(instance) -> bool:
+    """Отзыв или комментарий удаляется вместе с родителем (cascade_delete)."""
+    if isinstance(instance, Review):
+        return is_deleting(Title, instance.title_id)
+    if isinstance(instance, Comment):
+        return is_deleting(Review, instance.review_id)
+    return False
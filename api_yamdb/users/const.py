@@ -0,0 +1,4 @@
+EMAIL_BATCH_SIZE: int = 100
+EMAIL_MAX_ATTEMPTS: int = 5
+EMAIL_RETRY_DELAY: int = 60
+EMAIL_CLAIM_TIMEOUT: int = 300
@@ -1,5 +1,15 @@
 import secrets
 import string
+from datetime import timedelta
+from smtplib import SMTPException, SMTPServerDisconnected
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .const import (EMAIL_BATCH_SIZE, EMAIL_CLAIM_TIMEOUT, EMAIL_MAX_ATTEMPTS,
+                    EMAIL_RETRY_DELAY)
+from .models import OutgoingEmail
 
 
 def create_confirmation_code() -> str:
@@ -8,3 +18,119 @@ def create_confirmation_code() -> str:
         ''.join(secrets.choice(string.digits) for _ in range(9))
     )
     return confirmation_code
+
+
+def enqueue_email(subject: str, body: str, to_email: str) -> OutgoingEmail:
+    """Ставит письмо в очередь, отправит его команда send_emails."""
+    return OutgoingEmail.objects.create(
+        subject=subject, body=body, to_email=to_email
+    )
+
+
+def claim_emails(batch_size: int) -> list:
+    """
+    Забирает пачку писем, которым пора отправляться.
+
+    Время следующей попытки сдвигается на EMAIL_CLAIM_TIMEOUT, чтобы
+    параллельный обработчик не взял те же письма, а письма упавшего
+    обработчика вернулись в очередь.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                status=OutgoingEmail.PENDING, next_attempt_at__lte=now
+            )[:batch_size]
+        )
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(next_attempt_at=now + timedelta(seconds=EMAIL_CLAIM_TIMEOUT))
+    return emails
+
+
+def record_failure(email: OutgoingEmail, error: Exception) -> None:
+    """Неудачная попытка: задержка до следующей или отказ после последней."""
+    email.last_error = str(error)
+    if email.attempts >= EMAIL_MAX_ATTEMPTS:
+        email.status = OutgoingEmail.FAILED
+    email.next_attempt_at = timezone.now() + timedelta(
+        seconds=EMAIL_RETRY_DELAY * 2 ** (email.attempts - 1)
+    )
+
+
+def save_attempt(email: OutgoingEmail) -> None:
+    email.save(update_fields=(
+        'attempts', 'status', 'last_error', 'next_attempt_at', 'sent_at'
+    ))
+
+
+def release_emails(emails: list) -> None:
+    """Возвращает забранные письма в очередь, не считая попытку."""
+    OutgoingEmail.objects.filter(
+        pk__in=[email.pk for email in emails]
+    ).update(next_attempt_at=timezone.now())
+
+
+def reopen(connection) -> bool:
+    """Переподключается к SMTP-серверу после разрыва соединения."""
+    connection.close()
+    try:
+        connection.open()
+    except (SMTPException, OSError):
+        return False
+    return True
+
+
+def deliver_emails(batch_size: int = EMAIL_BATCH_SIZE) -> tuple:
+    """
+    Отправляет пачку писем через одно SMTP-подключение.
+
+    Неудачная отправка повторяется с экспоненциальной задержкой,
+    после EMAIL_MAX_ATTEMPTS попыток письмо помечается неотправленным.
+    Если не удалось подключиться, неудачной попыткой считается
+    отправка всех писем пачки. После разрыва соединения оно открывается
+    заново, а если это не удалось, остальные письма пачки возвращаются
+    в очередь без попытки.
+    Возвращает количество отправленных и неотправленных писем.
+    """
+    emails = claim_emails(batch_size)
+    if not emails:
+        return 0, 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except (SMTPException, OSError) as error:
+        for email in emails:
+            email.attempts += 1
+            record_failure(email, error)
+            save_attempt(email)
+        return 0, len(emails)
+    sent = failed = 0
+    try:
+        for index, email in enumerate(emails):
+            email.attempts += 1
+            try:
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    to=[email.to_email],
+                    connection=connection
+                ).send()
+            except (SMTPException, OSError) as error:
+                failed += 1
+                record_failure(email, error)
+                save_attempt(email)
+                if (
+                    isinstance(error, SMTPServerDisconnected)
+                    and not reopen(connection)
+                ):
+                    release_emails(emails[index + 1:])
+                    break
+                continue
+            sent += 1
+            email.status = OutgoingEmail.SENT
+            email.sent_at = timezone.now()
+            save_attempt(email)
+    finally:
+        connection.close()
+    return sent, failed
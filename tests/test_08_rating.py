@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def test_01_rating_follows_reviews(self, admin_client, admin, user_client,
+                                       user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+
+        response = admin_client.get(title_url)
+        assert response.json().get('rating') == 5, (
+            'Проверьте, что после создания отзывов рейтинг произведения '
+            'равен средней оценке.'
+        )
+        assert 'score_sum' not in response.json(), (
+            'Служебные счетчики рейтинга не должны попадать в ответ API.'
+        )
+
+        response = user_client.patch(
+            f'{reviews_url}{reviews[1]["id"]}/', data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = admin_client.get(title_url)
+        assert response.json().get('rating') == 6, (
+            'Проверьте, что при изменении оценки рейтинг произведения '
+            'пересчитывается.'
+        )
+
+        for review in reviews:
+            response = admin_client.delete(f'{reviews_url}{review["id"]}/')
+            assert response.status_code == HTTPStatus.NO_CONTENT
+        response = admin_client.get(title_url)
+        assert response.json().get('rating') is None, (
+            'Проверьте, что после удаления всех отзывов рейтинг произведения '
+            'становится `None`.'
+        )
+
+    def test_02_rebuild_ratings_command(self, admin_client, admin, user_client,
+                                        user):
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating=None, review_count=0, score_sum=0)
+
+        call_command('rebuild_ratings')
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.review_count, title.score_sum, title.rating) == (
+            2, 10, 5.0
+        ), (
+            'Проверьте, что команда `rebuild_ratings` восстанавливает '
+            'рейтинг произведения по таблице отзывов.'
+        )
+        assert Title.objects.get(pk=titles[1]['id']).rating is None
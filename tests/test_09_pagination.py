@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    def test_01_reviews_cursor(self, client, admin_client, admin, user_client,
+                               user, moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        response = client.get(url)
+        assert 'count' in response.json(), (
+            'Проверьте, что по умолчанию отзывы пагинируются постранично.'
+        )
+
+        seen = []
+        next_url = f'{url}?pagination=cursor&page_size=2'
+        with CaptureQueriesContext(connection) as queries:
+            while next_url:
+                response = client.get(next_url)
+                assert response.status_code == HTTPStatus.OK
+                data = response.json()
+                assert 'count' not in data, (
+                    'Проверьте, что в режиме курсора ответ не содержит '
+                    'ключа `count`.'
+                )
+                seen.extend(review['id'] for review in data['results'])
+                next_url = data['next']
+        assert not any(
+            'COUNT(' in query['sql'] for query in queries.captured_queries
+        ), 'В режиме курсора не должно выполняться запросов COUNT(*).'
+        assert seen == [review['id'] for review in reviews], (
+            'Проверьте, что в режиме курсора отзывы отдаются по '
+            '`pub_date` без пропусков и повторов.'
+        )
+
+    def test_02_comments_cursor_from_settings(self, client, admin_client,
+                                              admin, user_client, user,
+                                              settings):
+        settings.REVIEWS_PAGINATION = 'cursor'
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+
+        data = client.get(url).json()
+        assert 'count' not in data and 'next' in data, (
+            'Проверьте, что настройка `REVIEWS_PAGINATION` включает '
+            'пагинацию по курсору для комментариев.'
+        )
+        assert [comment['id'] for comment in data['results']] == [
+            comment['id'] for comment in comments
+        ]
+
+        data = client.get(f'{url}?pagination=page').json()
+        assert data.get('count') == len(comments), (
+            'Проверьте, что параметр `pagination=page` возвращает '
+            'постраничную пагинацию.'
+        )
@@ -0,0 +1,123 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+REVIEWS_COUNT = 10
+
+
+def create_many_reviews(django_user_model, title_id, count=REVIEWS_COUNT):
+    from reviews.models import Comment, Review
+
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        for idx in range(count)
+    ]
+    reviews = [
+        Review.objects.create(
+            title_id=title_id, author=author, text=f'review {idx}', score=7
+        )
+        for idx, author in enumerate(authors)
+    ]
+    for idx, author in enumerate(authors):
+        Comment.objects.create(
+            review=reviews[0], author=author, text=f'comment {idx}'
+        )
+    return reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10QueryCount:
+
+    def test_01_reviews_list_queries(self, client, admin_client,
+                                     django_user_model,
+                                     django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        create_many_reviews(django_user_model, titles[0]['id'])
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        # Версия данных, проверка произведения, COUNT(*) и страница
+        # отзывов с авторами.
+        with django_assert_num_queries(4):
+            response = client.get(url)
+        assert len(response.json()['results']) == REVIEWS_COUNT
+        assert {
+            review['author'] for review in response.json()['results']
+        } == {f'author{idx}' for idx in range(REVIEWS_COUNT)}, (
+            'Проверьте, что в списке отзывов поле `author` содержит '
+            'username автора.'
+        )
+
+    def test_02_comments_list_queries(self, client, admin_client,
+                                      django_user_model,
+                                      django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'])
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0].id}/comments/'
+        )
+
+        # Версия данных, проверка отзыва, COUNT(*) и страница
+        # комментариев с авторами.
+        with django_assert_num_queries(4):
+            response = client.get(url)
+        assert len(response.json()['results']) == REVIEWS_COUNT
+
+    def test_03_nested_parent_check(self, client, admin_client,
+                                    django_user_model, user_client,
+                                    django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'], 1)
+        url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+            f'{reviews[0].id}/comments/'
+        )
+
+        # Только проверка отзыва: версия данных читается после нее.
+        with django_assert_num_queries(1):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии к отзыву, который не относится к '
+            'произведению из url, не отдаются: должен вернуться ответ '
+            'со статусом 404.'
+        )
+        response = user_client.post(url, data={'text': 'comment'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что нельзя оставить комментарий к отзыву через url '
+            'другого произведения.'
+        )
+        response = client.get(f'{url}1/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('titles_count', (1, 5, 25))
+    def test_04_titles_list_queries(self, client, titles_count,
+                                    django_assert_num_queries):
+        from reviews.models import Category, Genre, Title
+
+        genres = [
+            Genre.objects.create(name=f'genre {idx}', slug=f'genre{idx}')
+            for idx in range(3)
+        ]
+        for idx in range(titles_count):
+            category = Category.objects.create(
+                name=f'category {idx}', slug=f'category{idx}'
+            )
+            title = Title.objects.create(
+                name=f'title {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+        # Версия данных, COUNT(*), страница произведений с категориями
+        # и жанры одним запросом, независимо от размера страницы.
+        with django_assert_num_queries(4):
+            response = client.get('/api/v1/titles/')
+        results = response.json()['results']
+        assert len(results) == titles_count
+        assert all(len(title['genre']) == 3 for title in results), (
+            'Проверьте, что в списке произведений для каждого произведения '
+            'выводятся все его жанры.'
+        )
@@ -0,0 +1,145 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.test_10_queries import create_many_reviews
+from tests.utils import create_categories, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    def test_01_categories_cache(self, client, admin_client):
+        from api.cache import stats
+
+        create_categories(admin_client)
+        url = '/api/v1/categories/'
+        hits = stats.hits
+
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(url)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдается из кеша.'
+        )
+        assert stats.hits == hits + 1
+
+        response = client.get(f'{url}?search=Фильм')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что параметры запроса входят в ключ кеша.'
+        )
+
+        admin_client.post(url, data={'name': 'Музыка', 'slug': 'music'})
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert len(response.json()['results']) == 3, (
+            f'Проверьте, что после добавления категории кеш `{url}` '
+            'сбрасывается.'
+        )
+
+    def test_02_title_cache_invalidation(self, client, admin_client,
+                                         user_client):
+        titles, _, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+
+        client.get(url)
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        create_single_review(user_client, titles[0]['id'], 'text', 3)
+        response = client.get(url)
+        assert response.json()['rating'] == 3, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведения.'
+        )
+
+        admin_client.patch(url, data={
+            'genre': [genres[2]['slug']], 'category': 'films'
+        })
+        response = client.get(url)
+        assert response.json()['genre'] == [genres[2]], (
+            'Проверьте, что изменение жанров произведения сбрасывает кеш.'
+        )
+
+    def test_03_cascade_delete(self, client, admin_client,
+                               django_user_model,
+                               django_assert_max_num_queries):
+        from reviews.models import Comment, Review, Title
+        from reviews.search import search
+
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'], 20)
+        Comment.objects.bulk_create(
+            Comment(review=review, author=review.author, text='каскад')
+            for review in reviews for _ in range(5)
+        )
+        url = '/api/v1/titles/'
+        client.get(url)
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        # Чтение произведения, его жанров, отзывов и комментариев,
+        # очистка поискового индекса и версия каталога - независимо
+        # от числа отзывов и комментариев.
+        with django_assert_max_num_queries(15):
+            response = admin_client.delete(f'{url}{titles[0]["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(url).json()['count'] == len(titles) - 1, (
+            'Проверьте, что удаление произведения сбрасывает кеш каталога.'
+        )
+        assert Title.objects.count() == len(titles) - 1
+        assert not search(Review.objects.all(), 'review').exists()
+        assert not search(Comment.objects.all(), 'comment').exists(), (
+            'Проверьте, что отзывы и комментарии удаленного произведения '
+            'удаляются из поискового индекса.'
+        )
+
+    def test_04_review_delete(self, client, admin_client, user_client,
+                              django_user_model):
+        from reviews.models import Comment
+        from reviews.search import search
+
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'], 3)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] == 7
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        reviews[0].delete()
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 7
+        assert not search(Comment.objects.all(), 'comment').exists(), (
+            'Проверьте, что комментарии удаленного отзыва удаляются '
+            'из поискового индекса.'
+        )
+        comment = Comment.objects.create(
+            review=reviews[1], author=reviews[1].author, text='новый'
+        )
+        comments_url = f'{url}reviews/{reviews[1].id}/comments/'
+        etag = client.get(comments_url)['ETag']
+        comment.delete()
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление комментария меняет ETag списка '
+            'комментариев.'
+        )
+        assert not search(Comment.objects.all(), 'новый').exists()
+
+    def test_05_cache_key_includes_host(self, client):
+        from reviews.models import Category
+
+        Category.objects.bulk_create(
+            Category(name=f'Категория {idx}', slug=f'category{idx}')
+            for idx in range(101)
+        )
+        url = '/api/v1/categories/?page=2'
+        response = client.get(url, HTTP_HOST='first.example')
+        assert response.json()['previous'].startswith('http://first.example/')
+        response = client.get(url, HTTP_HOST='second.example', secure=True)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['previous'].startswith(
+            'https://second.example/'
+        ), (
+            'Проверьте, что кешированные ссылки пагинации не отдаются '
+            'запросам к другому хосту или по другой схеме.'
+        )
+        response = client.get(url, HTTP_HOST='first.example')
+        assert response['X-Cache'] == 'HIT'
@@ -0,0 +1,154 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from tests.utils import (create_comments, create_single_comment,
+                         create_single_review, create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    def test_01_reviews_etag(self, client, admin_client, user_client,
+                             moderator_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+
+        # Проверка произведения и версия данных: она хранится в базе,
+        # общей для процессов.
+        with django_assert_num_queries(2):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304 '
+            'без чтения данных.'
+        )
+        assert response.get('ETag') == etag
+
+        other_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        response = client.get(other_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag различается для разных адресов.'
+        )
+
+        create_single_review(moderator_client, titles[0]['id'], 'text', 7)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва ETag списка отзывов '
+            'меняется.'
+        )
+        assert response.get('ETag') != etag
+        assert len(response.json()['results']) == 2
+
+    def test_02_comments_and_titles_etag(self, client, admin_client, admin,
+                                         user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        etag = client.get(url)['ETag']
+        title_etag = client.get('/api/v1/titles/')['ETag']
+
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'new'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления комментария ETag списка '
+            'комментариев меняется.'
+        )
+        response = client.get('/api/v1/titles/', HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что комментарии не сбрасывают ETag каталога.'
+        )
+
+    def test_03_etag_shared_between_processes(self, client, admin_client,
+                                              user_client):
+        from api.cache import get_cache
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        get_cache().clear()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что версия данных для ETag не теряется вместе '
+            'с кешем процесса.'
+        )
+
+        # Запись в другом процессе: его кеш не связан с кешем этого.
+        dummy = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+        with override_settings(
+            CACHES={'default': dummy, 'api': dummy, 'users': dummy}
+        ):
+            create_single_review(user_client, titles[0]['id'], 'text', 5)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что запись в другом процессе меняет ETag.'
+        )
+        assert len(response.json()['results']) == 1
+
+    def test_04_reads_do_not_write_versions(self, client, admin_client,
+                                            django_assert_num_queries):
+        from reviews.models import DataVersion
+
+        titles, _, _ = create_titles(admin_client)
+        scopes = set(DataVersion.objects.values_list('scope', flat=True))
+        for title_id in range(1000, 1003):
+            response = client.get(
+                f'/api/v1/titles/{title_id}/reviews/',
+                HTTP_IF_NONE_MATCH='*'
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что отзывы несуществующего произведения '
+                'возвращают 404 и на `If-None-Match: *`.'
+            )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(2):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что набор данных, который еще не менялся, имеет '
+            'постоянную версию.'
+        )
+        assert set(
+            DataVersion.objects.values_list('scope', flat=True)
+        ) == scopes, 'Проверьте, что GET-запросы не записывают версии данных.'
+
+    def test_05_version_bumped_on_commit(self, admin_client, admin):
+        from django.db import transaction
+
+        from api.cache import CATALOGUE, get_version
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        version = get_version(CATALOGUE)
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Review.objects.create(
+                    title_id=titles[0]['id'], author=admin,
+                    text='text', score=5
+                )
+                assert get_version(CATALOGUE) == version, (
+                    'Проверьте, что версия данных меняется после фиксации '
+                    'транзакции, а не внутри нее.'
+                )
+                raise RuntimeError
+        assert get_version(CATALOGUE) == version, (
+            'Проверьте, что откат транзакции не меняет версию данных.'
+        )
+        Review.objects.create(
+            title_id=titles[0]['id'], author=admin, text='text', score=5
+        )
+        assert get_version(CATALOGUE) > version
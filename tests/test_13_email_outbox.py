@@ -0,0 +1,139 @@
+from smtplib import SMTPServerDisconnected
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+    valid_data = {
+        'email': 'valid@yamdb.fake',
+        'username': 'valid_username'
+    }
+
+    def test_01_signup_enqueues_email(self, client):
+        from users.models import OutgoingEmail
+
+        outbox_before_count = len(mail.outbox)
+        client.post(self.url_signup, data=self.valid_data)
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.url_signup}` не отправляет '
+            'письмо сам, а ставит его в очередь.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.PENDING
+
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert mail.outbox[-1].to == [self.valid_data['email']]
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT
+
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    def test_02_failed_email_retried_with_backoff(self, client, monkeypatch):
+        from users import const, functions
+        from users.models import OutgoingEmail
+
+        def broken_send(self, fail_silently=False):
+            raise SMTPServerDisconnected('SMTP недоступен')
+
+        monkeypatch.setattr(functions.EmailMessage, 'send', broken_send)
+        client.post(self.url_signup, data=self.valid_data)
+
+        call_command('send_emails', '--once')
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что повторная отправка откладывается.'
+        )
+
+        for _ in range(const.EMAIL_MAX_ATTEMPTS - 1):
+            OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+            call_command('send_emails', '--once')
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.FAILED
+        assert email.attempts == const.EMAIL_MAX_ATTEMPTS
+        assert 'SMTP' in email.last_error
+
+    def test_03_connection_error(self, client, monkeypatch):
+        from users import functions
+        from users.models import OutgoingEmail
+
+        class BrokenConnection:
+            def open(self):
+                raise ConnectionRefusedError('Connection refused')
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr(functions, 'get_connection', BrokenConnection)
+        client.post(self.url_signup, data=self.valid_data)
+
+        call_command('send_emails', '--once')
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.PENDING
+        assert email.attempts == 1, (
+            'Проверьте, что ошибка подключения к SMTP-серверу считается '
+            'неудачной попыткой отправки письма.'
+        )
+        assert email.next_attempt_at > timezone.now()
+        assert 'refused' in email.last_error
+
+    @pytest.mark.parametrize('reconnects', (True, False))
+    def test_04_server_disconnected(self, monkeypatch, reconnects):
+        from users import functions
+        from users.models import OutgoingEmail
+
+        class DroppingConnection:
+            """Сервер рвет соединение на втором письме."""
+
+            opened = 0
+            sent = []
+
+            def open(self):
+                if DroppingConnection.opened and not reconnects:
+                    raise ConnectionRefusedError('Connection refused')
+                DroppingConnection.opened += 1
+
+            def close(self):
+                pass
+
+            def send_messages(self, messages):
+                if len(self.sent) == 1 and DroppingConnection.opened == 1:
+                    raise SMTPServerDisconnected('Connection closed')
+                self.sent.extend(messages)
+                return len(messages)
+
+        monkeypatch.setattr(functions, 'get_connection', DroppingConnection)
+        for idx in range(4):
+            functions.enqueue_email('Тема', 'Текст', f'user{idx}@yamdb.fake')
+
+        sent, failed = functions.deliver_emails()
+        emails = list(OutgoingEmail.objects.order_by('pk'))
+        assert [email.attempts for email in emails[:2]] == [1, 1]
+        assert emails[1].status == OutgoingEmail.PENDING
+        if reconnects:
+            assert (sent, failed) == (3, 1), (
+                'Проверьте, что после разрыва соединения с SMTP-сервером '
+                'оно открывается заново для остальных писем пачки.'
+            )
+            assert [email.status for email in emails[2:]] == [
+                OutgoingEmail.SENT, OutgoingEmail.SENT
+            ]
+        else:
+            assert (sent, failed) == (1, 1)
+            assert all(
+                email.attempts == 0 and email.next_attempt_at <= timezone.now()
+                for email in emails[2:]
+            ), (
+                'Проверьте, что если переподключиться не удалось, остальные '
+                'письма пачки возвращаются в очередь без попытки.'
+            )
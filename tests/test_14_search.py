@@ -0,0 +1,90 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14FullTextSearch:
+
+    def test_01_titles_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+
+        response = client.get(f'{url}?search=терминат')
+        names = [title['name'] for title in response.json()['results']]
+        assert names == [titles[0]['name']], (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `search` '
+            'находит произведения по началу слова в названии.'
+        )
+        response = client.get(f'{url}?search=yippie')
+        names = [title['name'] for title in response.json()['results']]
+        assert names == [titles[1]['name']], (
+            f'Проверьте, что поиск по `{url}` учитывает описание '
+            'произведения.'
+        )
+        response = client.get(f'{url}?search="AND OR (')
+        assert response.status_code == 200, (
+            'Проверьте, что служебные символы в `search` не ломают запрос.'
+        )
+
+        admin_client.patch(
+            f'{url}{titles[1]["id"]}/',
+            data={'name': 'Терминатор 2', 'category': 'books'}
+        )
+        response = client.get(f'{url}?search=терминатор')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что индекс обновляется при изменении произведения.'
+        )
+        admin_client.delete(f'{url}{titles[0]["id"]}/')
+        response = client.get(f'{url}?search=терминатор')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что удаленное произведение пропадает из поиска.'
+        )
+
+    def test_02_reviews_and_comments_search(self, client, admin_client, admin,
+                                            user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        response = client.get(f'{reviews_url}?search=review number 2')
+        assert [
+            review['id'] for review in response.json()['results']
+        ] == [reviews[1]['id']], (
+            f'Проверьте, что поиск по `{reviews_url}` находит отзывы по '
+            'тексту.'
+        )
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        response = client.get(f'{comments_url}?search=comment')
+        assert response.json()['count'] == len(comments)
+
+        from reviews.search import SEARCH_TABLES
+
+        with connection.cursor() as cursor:
+            for table, _ in SEARCH_TABLES.values():
+                cursor.execute(f'DELETE FROM {table}')
+        assert client.get(
+            f'{reviews_url}?search=review'
+        ).json()['count'] == 0
+        call_command('rebuild_search_index')
+        assert client.get(
+            f'{reviews_url}?search=review'
+        ).json()['count'] == len(reviews), (
+            'Проверьте, что команда `rebuild_search_index` восстанавливает '
+            'поисковый индекс.'
+        )
+
+    def test_03_postgres_search_uses_index(self, admin_client):
+        from reviews.models import Title
+        from reviews.search import search
+
+        if connection.vendor != 'postgresql':
+            pytest.skip('GIN-индекс поиска создается на PostgreSQL.')
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        plan = search(Title.objects.all(), 'терминатор').explain()
+        assert 'reviews_title_search_idx' in plan, (
+            'Проверьте, что поиск на PostgreSQL идет по GIN-индексу.'
+        )
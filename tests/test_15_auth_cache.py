@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15CachedJWTUser:
+
+    def test_01_no_user_query_when_cached(self, admin_client, user_client,
+                                          django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        # Версия данных, проверка произведения, COUNT(*) и страница
+        # отзывов, пользователь берется из кеша.
+        with django_assert_num_queries(4):
+            response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_role_change_invalidates_cache(self, admin_client, user_client,
+                                              user):
+        url = '/api/v1/categories/'
+        data = {'name': 'Музыка', 'slug': 'music'}
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что после смены роли пользователя его права '
+            'применяются сразу, без ожидания устаревания кеша.'
+        )
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удаленного пользователя перестает '
+            'приниматься сразу после удаления.'
+        )
+
+    def test_03_cache_is_shared_and_bounded(self, settings):
+        from api.authentication import USER_CACHE_ALIAS
+
+        options = settings.CACHES[USER_CACHE_ALIAS]
+        assert options['OPTIONS']['MAX_ENTRIES'] == (
+            settings.JWT_USER_CACHE_SIZE
+        ), (
+            'Проверьте, что кеш пользователей хранит не больше '
+            '`JWT_USER_CACHE_SIZE` записей.'
+        )
+        assert options['TIMEOUT'] == settings.JWT_USER_CACHE_TIMEOUT
+
+    def test_04_inactive_cached_user(self, user_client, user):
+        from api.authentication import get_user_cache, user_cache_key
+
+        url = '/api/v1/users/me/'
+        assert user_client.get(url).status_code == HTTPStatus.OK
+        cached = get_user_cache().get(user_cache_key(user.pk))
+        assert cached is not None and cached.username == user.username, (
+            'Проверьте, что пользователь из JWT хранится в кеше `users`, '
+            'общем для процессов при общем бэкенде.'
+        )
+        # Запись в другом процессе, сигнал которого не дошел до кеша.
+        cached.is_active = False
+        get_user_cache().set(user_cache_key(user.pk), cached)
+        assert user_client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что у пользователя из кеша проверяется `is_active`.'
+        )
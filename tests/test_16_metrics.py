@@ -0,0 +1,42 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Metrics:
+    url = '/api/v1/_metrics'
+
+    def test_01_server_timing(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        server_timing = response.get('Server-Timing', '')
+        for metric in ('total;dur=', 'db;dur=', 'serialize;dur='):
+            assert metric in server_timing, (
+                'Проверьте, что ответ API содержит заголовок `Server-Timing` '
+                f'с метрикой `{metric[:-5]}`.'
+            )
+
+    def test_02_metrics_endpoint(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+
+        assert client.get(self.url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(self.url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.url}` доступен только администратору.'
+        )
+        response = admin_client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain')
+        body = response.content.decode()
+        assert (
+            'api_request_duration_seconds{route="reviews-list",'
+            'quantile="0.99"}'
+        ) in body, (
+            f'Проверьте, что `{self.url}` отдает перцентили времени ответа '
+            'по маршрутам в формате Prometheus.'
+        )
+        assert 'api_request_db_queries_count{route="reviews-list"}' in body
+        assert 'api_response_cache_hits_total' in body
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitlesBulkCreate:
+    url = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_create(self, client, admin_client, user_client,
+                            django_assert_max_num_queries):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'category': categories[idx % 2]['slug'],
+                'genre': [genres[0]['slug'], genres[idx % 3]['slug']],
+                'description': 'Описание'
+            }
+            for idx in range(20)
+        ]
+        data.append({'name': 'Без категории', 'year': 2000,
+                     'category': 'missing', 'genre': []})
+        data.append({'name': 'Из будущего', 'year': 3000,
+                     'category': categories[0]['slug'], 'genre': ['nope']})
+
+        response = user_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.url}` доступен только администратору.'
+        )
+
+        # Категории и жанры ищутся двумя запросами на весь список,
+        # произведения, их id, поисковый индекс, жанры и версия каталога
+        # пишутся запросами на весь список, независимо от его размера.
+        with django_assert_max_num_queries(11):
+            response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        result = response.json()
+        assert len(result['created']) == 20, (
+            f'Проверьте, что POST-запрос к `{self.url}` создает все '
+            'корректные произведения из списка.'
+        )
+        assert [error['index'] for error in result['errors']] == [20, 21], (
+            f'Проверьте, что POST-запрос к `{self.url}` возвращает ошибки '
+            'по индексу элемента, не прерывая создание остальных.'
+        )
+        assert set(result['errors'][1]['errors']) == {'year', 'genre'}
+
+        created = result['created'][1]
+        assert created['category'] == categories[1]
+        assert created['genre'] == [genres[0], genres[1]]
+        response = client.get(f'/api/v1/titles/{created["id"]}/')
+        assert response.json()['genre'] == [genres[0], genres[1]]
+        assert response.json()['name'] == created['name'], (
+            'Проверьте, что созданным произведениям присвоены их id.'
+        )
+        assert client.get('/api/v1/titles/').json()['count'] == 20, (
+            'Проверьте, что после массового создания кеш списка '
+            'произведений сбрасывается.'
+        )
+        response = client.get('/api/v1/titles/?search=произведение')
+        assert response.json()['count'] == 20
+
+    def test_02_bulk_create_validation(self, admin_client):
+        response = admin_client.post(
+            self.url, data={'name': 'one'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            self.url, data=[{'name': 'x'}], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['created'] == []
+
+    def test_03_bulk_create_genre_type(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        item = {'name': 'x', 'year': 2000, 'category': categories[0]['slug']}
+        data = [
+            {**item, 'genre': 5},
+            {**item, 'genre': genres[0]['slug']},
+            {**item, 'genre': [genres[0]['slug'], 7]},
+            {**item, 'genre': [genres[0]['slug']]},
+        ]
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        result = response.json()
+        assert len(result['created']) == 1
+        assert [error['index'] for error in result['errors']] == [0, 1, 2], (
+            f'Проверьте, что POST-запрос к `{self.url}` возвращает ошибку '
+            'элемента, если `genre` не список slug жанров.'
+        )
+        assert all(
+            set(error['errors']) == {'genre'} for error in result['errors']
+        )
@@ -0,0 +1,90 @@
+import json
+from csv import DictReader
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb/static/data'
+
+
+def read_streaming(response):
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Export:
+
+    def test_01_export_endpoint(self, client, user_client, admin_client,
+                                admin, user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = '/api/v1/export/review.csv'
+
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+        assert admin_client.get(
+            '/api/v1/export/unknown.csv'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{url}` отдает выгрузку потоком.'
+        )
+        rows = list(DictReader(read_streaming(response).splitlines()))
+        with open(DATA_DIR / 'review.csv', encoding='utf-8') as f:
+            header = DictReader(f).fieldnames
+        assert list(rows[0]) == header, (
+            'Проверьте, что колонки выгрузки совпадают с '
+            '`static/data/review.csv`.'
+        )
+        assert [int(row['id']) for row in rows] == [
+            review['id'] for review in reviews
+        ]
+
+        response = admin_client.get('/api/v1/export/comments.ndjson')
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        lines = [
+            json.loads(line)
+            for line in read_streaming(response).splitlines()
+        ]
+        assert len(lines) == len(comments)
+        assert lines[0]['text'] == comments[0]['text']
+        assert lines[0]['review_id'] == reviews[0]['id']
+
+    def test_02_export_command_round_trip(self, admin_client, admin,
+                                          user_client, user, tmp_path,
+                                          monkeypatch):
+        from app.management.commands import load_data
+        from reviews.models import Comment, Review, Title
+
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        call_command('export_data', '--dir', str(tmp_path), '--chunk-size', 2)
+        assert {path.name for path in tmp_path.iterdir()} == set(
+            load_data.FILE_DATA_TO_MODEL
+        ), (
+            'Проверьте, что команда `export_data` выгружает все файлы, '
+            'которые загружает `load_data`.'
+        )
+
+        Title.objects.all().delete()
+        assert not Review.objects.exists()
+        monkeypatch.setattr(load_data, 'DATA_DIR', tmp_path)
+        call_command('load_data')
+        assert Title.objects.count() == len(titles)
+        assert Review.objects.count() == len(reviews)
+        assert Comment.objects.count() == len(comments), (
+            'Проверьте, что выгрузка `export_data` загружается обратно '
+            'командой `load_data`.'
+        )
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert [
+            genre['slug'] for genre in response.json()['genre']
+        ] == titles[0]['genre']
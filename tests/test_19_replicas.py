@@ -0,0 +1,116 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def routed_reads(monkeypatch, settings):
+    """Запоминает, на какие базы роутер отправлял чтения."""
+    from api.replicas import ReplicaRouter
+
+    settings.DATABASE_REPLICAS = ['default']
+    reads = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def spy(self, model, **hints):
+        from api.replicas import reading_from_replicas
+
+        reads.append(reading_from_replicas.get())
+        return db_for_read(self, model, **hints)
+
+    monkeypatch.setattr(ReplicaRouter, 'db_for_read', spy)
+    return reads
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Replicas:
+
+    def test_01_router(self, settings):
+        from api.replicas import ReplicaRouter, reading_from_replicas
+        from reviews.models import Title
+
+        router = ReplicaRouter()
+        settings.DATABASE_REPLICAS = ['replica1', 'replica2']
+        assert router.db_for_read(Title) == 'default', (
+            'Проверьте, что вне запросов к API чтение идет в default.'
+        )
+        token = reading_from_replicas.set(True)
+        try:
+            assert {router.db_for_read(Title) for _ in range(50)} == {
+                'replica1', 'replica2'
+            }, 'Проверьте, что чтения распределяются между репликами.'
+            assert router.db_for_write(Title) == 'default'
+        finally:
+            reading_from_replicas.reset(token)
+        settings.DATABASE_REPLICAS = []
+        token = reading_from_replicas.set(True)
+        try:
+            assert router.db_for_read(Title) == 'default'
+        finally:
+            reading_from_replicas.reset(token)
+
+    def test_02_safe_requests_read_from_replicas(self, client, admin_client,
+                                                 routed_reads):
+        titles, _, _ = create_titles(admin_client)
+        routed_reads.clear()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert client.get(url).status_code == 200
+        assert routed_reads and all(routed_reads), (
+            f'Проверьте, что GET-запрос к `{url}` читает данные из реплик.'
+        )
+
+    def test_03_read_your_writes(self, admin_client, user_client,
+                                 routed_reads, settings):
+        from django.core.cache import cache
+
+        from api.replicas import PIN_COOKIE
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # Первый запрос загружает пользователя в кеш аутентификации.
+        user_client.get(url)
+        routed_reads.clear()
+        user_client.get(url)
+        assert all(routed_reads)
+
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+        assert response.cookies[PIN_COOKIE]['max-age'] == (
+            settings.REPLICA_STICKY_SECONDS
+        )
+        # Следующий запрос может попасть в другой процесс.
+        cache.clear()
+        routed_reads.clear()
+        response = user_client.get(url)
+        assert response.json()['count'] == 1
+        assert routed_reads and not any(routed_reads), (
+            'Проверьте, что после записи пользователь читает из default, '
+            'пока реплики не догнали основную базу, в любом процессе.'
+        )
+
+        user_client.cookies.pop(PIN_COOKIE)
+        routed_reads.clear()
+        user_client.get(url)
+        assert all(routed_reads), (
+            'Проверьте, что после окончания окна пользователь снова '
+            'читает из реплик.'
+        )
+
+    def test_04_no_cache_from_lagging_replica(self, client, admin_client,
+                                              routed_reads, settings):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        response = client.get(url)
+        assert response.status_code == 200
+        assert 'ETag' not in response, (
+            'Проверьте, что ответ из реплики сразу после изменения данных '
+            'не получает ETag новой версии.'
+        )
+        assert client.get(url)['X-Cache'] == 'MISS', (
+            'Проверьте, что ответ из реплики сразу после изменения данных '
+            'не попадает в кеш.'
+        )
+
+        settings.REPLICA_STICKY_SECONDS = 0
+        assert 'ETag' in client.get(url)
+        assert client.get(url)['X-Cache'] == 'HIT'
@@ -0,0 +1,24 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SQLiteProfile:
+
+    def test_01_pragmas_applied(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Профиль применяется только к SQLite.')
+        pragmas = settings.SQLITE_PROFILES[settings.SQLITE_PROFILE]
+        with connection.cursor() as cursor:
+            for name in ('busy_timeout', 'synchronous', 'cache_size'):
+                if name not in pragmas:
+                    continue
+                cursor.execute(f'PRAGMA {name}')
+                value = cursor.fetchone()[0]
+                expected = {'NORMAL': 1}.get(pragmas[name], pragmas[name])
+                assert value == expected, (
+                    f'Проверьте, что при подключении к SQLite выполняется '
+                    f'`PRAGMA {name} = {pragmas[name]}` из профиля '
+                    f'`{settings.SQLITE_PROFILE}`.'
+                )
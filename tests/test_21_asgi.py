@@ -0,0 +1,127 @@
+import json
+from functools import partial
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+
+from tests.utils import create_comments, create_titles
+
+
+async def asgi_get(application, path, headers=(), chunks=None):
+    communicator = ApplicationCommunicator(application, {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), *headers],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    })
+    await communicator.send_input({'type': 'http.request', 'body': b''})
+    start = await communicator.receive_output(10)
+    body = b''
+    more_body = True
+    while more_body:
+        message = await communicator.receive_output(10)
+        body += message.get('body', b'')
+        if chunks is not None:
+            chunks.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    await communicator.wait(10)
+    return start['status'], dict(start['headers']), body
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21AsyncReads:
+
+    def test_01_async_views_routed(self):
+        from django.urls import resolve
+
+        match = resolve('/api/v1/titles/', urlconf='api_yamdb.urls_asgi')
+        assert match.func.__code__.co_flags & 0x80, (
+            'Проверьте, что под ASGI список произведений обрабатывается '
+            'асинхронным view.'
+        )
+        match = resolve('/api/v1/titles/')
+        assert not match.func.__code__.co_flags & 0x80, (
+            'Проверьте, что под WSGI остаются синхронные view.'
+        )
+
+    def test_02_asgi_matches_wsgi(self, client, admin_client, admin,
+                                  user_client, user):
+        from api_yamdb.asgi import application
+
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        for url in (
+            '/api/v1/titles/',
+            title_url,
+            f'{title_url}reviews/',
+            review_url,
+            f'{review_url}comments/',
+        ):
+            status, headers, body = async_to_sync(asgi_get)(application, url)
+            response = client.get(url)
+            assert status == response.status_code == 200
+            assert json.loads(body) == response.json(), (
+                f'Проверьте, что GET-запрос к `{url}` под ASGI возвращает '
+                'то же, что и под WSGI.'
+            )
+            assert b'"0 queries"' not in headers[b'Server-Timing'], (
+                'Проверьте, что под ASGI запросы к базе из пула потоков '
+                'учитываются в метриках.'
+            )
+        status, _, _ = async_to_sync(asgi_get)(
+            application, '/api/v1/titles/0/reviews/'
+        )
+        assert status == 404
+
+    def test_03_export_under_asgi(self, admin_client, token_admin):
+        from api_yamdb.asgi import application
+
+        create_titles(admin_client)
+        url = '/api/v1/export/titles.csv'
+        status, headers, body = async_to_sync(asgi_get)(
+            application, url,
+            [(b'authorization', f'Bearer {token_admin["access"]}'.encode())]
+        )
+        response = admin_client.get(url)
+        assert status == 200, (
+            f'Проверьте, что выгрузка `{url}` работает под ASGI.'
+        )
+        assert body == b''.join(response.streaming_content)
+        assert headers[b'Content-Type'] == response['Content-Type'].encode()
+        assert b'attachment' in headers[b'Content-Disposition']
+
+    def test_04_export_streamed_under_asgi(self, admin_client, token_admin,
+                                           monkeypatch):
+        from api import views
+        from api_yamdb.asgi import application
+        from reviews.export import export_chunks
+
+        titles, _, _ = create_titles(admin_client)
+        monkeypatch.setattr(
+            views, 'export_chunks', partial(export_chunks, chunk_size=1)
+        )
+        chunks = []
+        status, _, body = async_to_sync(asgi_get)(
+            application, '/api/v1/export/titles.ndjson',
+            [(b'authorization', f'Bearer {token_admin["access"]}'.encode())],
+            chunks
+        )
+        assert status == 200
+        assert [json.loads(line)['id'] for line in body.splitlines()] == [
+            title['id'] for title in titles
+        ]
+        assert len([chunk for chunk in chunks if chunk]) == len(titles), (
+            'Проверьте, что под ASGI выгрузка отдается клиенту по кускам, '
+            'а не собирается целиком перед отправкой.'
+        )
@@ -0,0 +1,54 @@
+import json
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+
+class Test22FastJSONRenderer:
+
+    def test_01_same_output_as_drf(self):
+        from api.renderers import FastJSONRenderer
+
+        data = OrderedDict(
+            count=2,
+            results=[
+                {
+                    'id': 1,
+                    'name': 'Произведение\u2028',
+                    'pub_date': datetime(
+                        2020, 1, 13, 23, 20, 2, 422123, tzinfo=timezone.utc
+                    ),
+                    'rating': Decimal('7.50'),
+                    'uuid': uuid.UUID(int=1),
+                    'genre': ({'slug': 'drama'},),
+                    'lazy': gettext_lazy('Фильм'),
+                    'tags': {'a'},
+                    1: None,
+                },
+            ]
+        )
+        expected = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == expected, (
+            'Проверьте, что FastJSONRenderer отдает тот же JSON, что и '
+            'JSONRenderer.'
+        )
+        assert FastJSONRenderer().render(None) == b''
+        assert FastJSONRenderer().render(
+            data, 'application/json; indent=4'
+        ) == JSONRenderer().render(data, 'application/json; indent=4')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_api_uses_fast_renderer(self, client):
+        from django.conf import settings
+
+        assert settings.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'][0] == (
+            'api.renderers.FastJSONRenderer'
+        )
+        response = client.get('/api/v1/titles/')
+        assert response['Content-Type'] == 'application/json'
+        assert 'results' in json.loads(response.content)
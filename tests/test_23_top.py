@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TopTitles:
+    url = '/api/v1/titles/top/'
+
+    @staticmethod
+    def create_rated_titles(admin_client):
+        from reviews.models import Title
+
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        ratings = [7.5, None, 9.0, 3.0, 9.0, None, 5.0]
+        ids = []
+        for number, rating in enumerate(ratings):
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number}',
+                'year': 2000 + number % 2,
+                'genre': [genres[number % 3]['slug']],
+                'category': categories[number % 2]['slug'],
+            })
+            ids.append(response.json()['id'])
+            if rating is not None:
+                Title.objects.filter(pk=ids[-1]).update(
+                    rating=rating, review_count=1
+                )
+        return ids, categories, genres
+
+    def test_01_top(self, client, admin_client):
+        ids, categories, genres = self.create_rated_titles(admin_client)
+        response = client.get(self.url)
+        assert response.status_code == 200, (
+            f'Проверьте, что `{self.url}` доступен без токена.'
+        )
+        assert [title['id'] for title in response.json()] == [
+            ids[2], ids[4], ids[0], ids[6], ids[3]
+        ], (
+            f'Проверьте, что `{self.url}` возвращает произведения по '
+            'убыванию рейтинга, при равном рейтинге - по id, без '
+            'произведений без отзывов.'
+        )
+        response = client.get(f'{self.url}?limit=2')
+        assert [title['id'] for title in response.json()] == [
+            ids[2], ids[4]
+        ]
+        response = client.get(
+            f'{self.url}?category={categories[1]["slug"]}'
+        )
+        assert [title['id'] for title in response.json()] == [ids[3]]
+        response = client.get(f'{self.url}?genre={genres[0]["slug"]}')
+        assert [title['id'] for title in response.json()] == [
+            ids[0], ids[6], ids[3]
+        ]
+        response = client.get(f'{self.url}?year=2000')
+        assert [title['id'] for title in response.json()] == [
+            ids[2], ids[4], ids[0], ids[6]
+        ]
+        assert client.get(f'{self.url}?limit=abc').status_code == 400
+
+    def test_02_top_uses_index(self, client, admin_client,
+                               django_assert_max_num_queries):
+        from reviews.models import Title
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется на SQLite.')
+        self.create_rated_titles(admin_client)
+        plan = Title.objects.filter(rating__isnull=False).order_by(
+            '-rating', 'id'
+        )[:10].explain()
+        assert 'title_rating_idx' in plan and 'TEMP B-TREE' not in plan, (
+            'Проверьте, что лучшие произведения выбираются по индексу '
+            'рейтинга без сортировки всей таблицы.'
+        )
+        with django_assert_max_num_queries(3):
+            client.get(f'{self.url}?limit=100')
+
+    def test_03_list_uses_index(self, client, admin_client):
+        from api.views import TitleViewSet
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется на SQLite.')
+        ids, _, _ = self.create_rated_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        assert [title['id'] for title in response.json()['results']] == [
+            ids[1], ids[5], ids[3], ids[6], ids[0], ids[2], ids[4]
+        ], (
+            'Проверьте, что список произведений упорядочен по рейтингу, '
+            'при равном рейтинге - по id.'
+        )
+        plan = TitleViewSet.queryset[10:20].explain()
+        assert 'title_list_idx' in plan and 'TEMP B-TREE' not in plan, (
+            'Проверьте, что страница списка произведений читается по '
+            'индексу в порядке списка без сортировки всей таблицы.'
+        )
@@ -0,0 +1,79 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ScoreHistogram:
+
+    def test_01_histogram_on_detail(self, client, admin_client, user_client,
+                                    moderator_client,
+                                    user_superuser_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(title_url).json()
+        assert response['score_histogram'] == {
+            str(score): 0 for score in range(1, 11)
+        }, (
+            f'Проверьте, что ответ на GET-запрос к `{title_url}` содержит '
+            'поле `score_histogram` со всеми оценками от 1 до 10.'
+        )
+        assert response['score_median'] is None
+
+        reviews = [
+            create_single_review(author, titles[0]['id'], 'Отзыв', score)
+            for author, score in (
+                (admin_client, 2), (user_client, 8),
+                (moderator_client, 8), (user_superuser_client, 10),
+            )
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(title_url).json()
+        assert not any(
+            'reviews_review' in query['sql'] for query in queries
+        ), (
+            'Проверьте, что распределение оценок берется из счетчиков '
+            'произведения, а не из таблицы отзывов.'
+        )
+        assert response['score_histogram']['8'] == 2
+        assert response['score_histogram']['2'] == 1
+        assert response['score_median'] == 8
+        assert response['score_percentiles'] == {
+            'p25': 2, 'p50': 8, 'p75': 8, 'p90': 10
+        }, (
+            f'Проверьте, что ответ на GET-запрос к `{title_url}` содержит '
+            'перцентили оценок.'
+        )
+
+        review_url = f'{title_url}reviews/{reviews[1].json()["id"]}/'
+        user_client.patch(review_url, data={'score': 3})
+        admin_client.delete(f'{title_url}reviews/{reviews[0].json()["id"]}/')
+        response = client.get(title_url).json()
+        histogram = response['score_histogram']
+        assert (histogram['2'], histogram['3'], histogram['8']) == (0, 1, 1), (
+            'Проверьте, что гистограмма оценок обновляется при изменении '
+            'и удалении отзыва.'
+        )
+        assert response['rating'] == 7
+
+        list_item = client.get('/api/v1/titles/').json()['results'][0]
+        assert 'score_histogram' not in list_item
+        assert 'score_1' not in list_item
+
+    def test_02_rebuild(self, client, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 4)
+        Title.objects.update(score_4=0, score_5=3)
+        call_command('rebuild_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.score_histogram == {
+            score: int(score == 4) for score in range(1, 11)
+        }, (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'гистограмму оценок.'
+        )
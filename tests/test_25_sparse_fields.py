@@ -0,0 +1,132 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.test_10_queries import create_many_reviews
+from tests.utils import create_titles
+
+
+def select_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SparseFields:
+
+    def test_01_titles_fields(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/?fields=id,name')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert {title['id'] for title in results} == {
+            title['id'] for title in titles
+        }
+        assert all(set(title) == {'id', 'name'} for title in results), (
+            'Проверьте, что `?fields=` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        queries = select_queries(context)
+        # Версия данных, COUNT(*) и страница без жанров.
+        assert len(queries) == 3, (
+            'Проверьте, что без полей category и genre список произведений '
+            'не запрашивает жанры.'
+        )
+        page = queries[-1]
+        assert 'JOIN' not in page and '"description"' not in page, (
+            'Проверьте, что колонки и связи незапрошенных полей не '
+            'читаются из базы.'
+        )
+
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/?fields=category,genre'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {'category', 'genre'}
+        assert response.json()['category']['slug'] == titles[0]['category']
+        assert [
+            genre['slug'] for genre in response.json()['genre']
+        ] == titles[0]['genre']
+
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/?fields=id,score_median'
+        )
+        assert response.json() == {'id': titles[0]['id'], 'score_median': None}
+
+    def test_02_titles_compact(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/?compact=true')
+        assert response.status_code == HTTPStatus.OK
+        assert all(
+            set(title) == {'id', 'name', 'year', 'rating'}
+            for title in response.json()['results']
+        ), 'Проверьте компактный режим списка произведений `?compact=true`.'
+        response = client.get('/api/v1/titles/top/?compact=1')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_unknown_field(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?fields=id,password')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что на неизвестное поле в `?fields=` возвращается '
+            'ответ со статусом 400.'
+        )
+        assert 'password' in response.json()['fields']
+
+    def test_04_reviews_and_comments(self, client, admin_client,
+                                     django_user_model,
+                                     django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'])
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}?fields=id,score')
+        results = response.json()['results']
+        assert len(results) == len(reviews)
+        assert all(set(review) == {'id', 'score'} for review in results)
+        assert all('JOIN' not in sql for sql in select_queries(context)), (
+            'Проверьте, что без поля author отзывы не соединяются '
+            'с пользователями.'
+        )
+
+        with django_assert_num_queries(3):
+            response = client.get(
+                f'{url}?compact=true&pagination=cursor&page_size=3'
+            )
+        data = response.json()
+        assert all(
+            set(review) == {'id', 'author', 'score', 'pub_date'}
+            for review in data['results']
+        )
+        assert data['next'], (
+            'Проверьте, что пагинация по курсору работает с `?fields=`.'
+        )
+
+        url = f'{url}{reviews[0].id}/comments/'
+        response = client.get(f'{url}?fields=text')
+        assert {comment['text'] for comment in response.json()['results']} == {
+            f'comment {idx}' for idx in range(len(reviews))
+        }
+        assert all(
+            set(comment) == {'id', 'author', 'text'}
+            for comment in client.get(f'{url}?compact=1').json()['results']
+        )
+
+    def test_05_writes_ignore_fields(self, admin_client,
+                                     django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'], 1)
+        response = admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0].id}/'
+            '?fields=id',
+            data={'text': 'Новый текст'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['text'] == 'Новый текст', (
+            'Проверьте, что `?fields=` не влияет на запись.'
+        )
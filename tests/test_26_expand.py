@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.test_10_queries import create_many_reviews
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Expand:
+
+    def test_01_expand_reviews(self, client, admin_client,
+                               django_user_model):
+        from api.views import TitleViewSet
+
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(
+            django_user_model, titles[0]['id'],
+            TitleViewSet.expand_reviews_limit + 2
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        data = client.get(f'{url}?expand=reviews').json()
+        assert data['name'] == titles[0]['name']
+        assert data['reviews']['count'] == len(reviews), (
+            'Проверьте, что `?expand=reviews` возвращает общее число '
+            'отзывов произведения.'
+        )
+        assert [review['id'] for review in data['reviews']['results']] == [
+            review.id for review in reviews
+        ][:TitleViewSet.expand_reviews_limit], (
+            'Проверьте, что `?expand=reviews` возвращает первые '
+            '`expand_reviews_limit` отзывов по дате публикации.'
+        )
+        assert data['reviews']['results'][0]['author'] == 'author0'
+        assert 'comments' not in data['reviews']['results'][0]
+        assert 'reviews' not in client.get(url).json(), (
+            'Проверьте, что без `?expand=` отзывы в ответ не попадают.'
+        )
+
+    def test_02_expand_comments_queries(self, client, admin_client,
+                                        django_user_model,
+                                        django_assert_num_queries):
+        from api.views import TitleViewSet
+        from reviews.models import Comment
+
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'])
+        Comment.objects.create(
+            review=reviews[1], author=reviews[1].author, text='comment'
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/?expand=reviews.comments'
+
+        # Версия данных, произведение, жанры, отзывы и комментарии к ним.
+        with django_assert_num_queries(5):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['reviews']['results']
+        limit = TitleViewSet.expand_comments_limit
+        assert results[0]['comments']['count'] == len(reviews)
+        assert [
+            comment['text'] for comment in results[0]['comments']['results']
+        ] == [f'comment {idx}' for idx in range(limit)], (
+            'Проверьте, что к каждому отзыву выводятся первые '
+            '`expand_comments_limit` комментариев.'
+        )
+        assert results[1]['comments'] == {
+            'count': 1,
+            'results': [{
+                'id': results[1]['comments']['results'][0]['id'],
+                'text': 'comment',
+                'author': 'author1',
+                'pub_date': results[1]['comments']['results'][0]['pub_date'],
+            }],
+        }
+        assert results[2]['comments'] == {'count': 0, 'results': []}
+
+    def test_03_expand_cache(self, client, admin_client, django_user_model):
+        from reviews.models import Comment
+
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'], 1)
+        url = f'/api/v1/titles/{titles[0]["id"]}/?expand=reviews.comments'
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        etag = response['ETag']
+        assert client.get(url)['X-Cache'] == 'HIT'
+        Comment.objects.create(
+            review=reviews[0], author=reviews[0].author, text='new'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag произведения '
+            'с `?expand=reviews.comments`.'
+        )
+        comments = response.json()['reviews']['results'][0]['comments']
+        assert comments['count'] == 2, (
+            'Проверьте, что новый комментарий сбрасывает кеш произведения '
+            'с `?expand=reviews.comments`.'
+        )
+
+    def test_04_unknown_expand(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/?expand=reviews,author'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что на неизвестную связь в `?expand=` возвращается '
+            'ответ со статусом 400.'
+        )
+
+    def test_05_expand_with_fields(self, client, admin_client,
+                                   django_user_model,
+                                   django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'], 3)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        # Версия данных и произведение, отзывы не читаются.
+        with django_assert_num_queries(2):
+            response = client.get(f'{url}?fields=id,name&expand=reviews')
+        assert response.json() == {
+            'id': titles[0]['id'], 'name': titles[0]['name']
+        }, (
+            'Проверьте, что `?expand=reviews` не добавляет отзывы, '
+            'если их нет среди полей `?fields=`.'
+        )
+        # Версия данных, произведение с review_count и отзывы.
+        with django_assert_num_queries(3):
+            response = client.get(f'{url}?fields=id,reviews&expand=reviews')
+        data = response.json()
+        assert set(data) == {'id', 'reviews'}
+        assert data['reviews']['count'] == len(reviews), (
+            'Проверьте, что с `?fields=` число отзывов для `?expand=reviews` '
+            'читается вместе с произведением.'
+        )
+        assert 'reviews' not in client.get(f'{url}?fields=id,reviews').json()
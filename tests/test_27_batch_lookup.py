@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from tests.test_10_queries import create_many_reviews
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27BatchLookup:
+
+    def test_01_titles_by_ids(self, client, admin_client,
+                              django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        ids = [titles[1]['id'], 9999, titles[0]['id'], titles[1]['id']]
+        # Версия данных, произведения с категориями одним IN и жанры
+        # одним запросом.
+        with django_assert_num_queries(3):
+            response = client.get(
+                f'/api/v1/titles/?ids={",".join(map(str, ids))}'
+            )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            'Проверьте, что `?ids=` возвращает произведения в порядке '
+            'запрошенных id без повторов.'
+        )
+        assert data['missing'] == [9999], (
+            'Проверьте, что `?ids=` перечисляет не найденные id в `missing`.'
+        )
+        assert data['results'][0]['category']['slug'] == titles[1]['category']
+        assert [
+            genre['slug'] for genre in data['results'][1]['genre']
+        ] == titles[0]['genre']
+
+    def test_02_limit_and_errors(self, client, admin_client):
+        create_titles(admin_client)
+        with override_settings(BATCH_LOOKUP_LIMIT=3):
+            response = client.get('/api/v1/titles/?ids=1,2,3,4')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что число значений `?ids=` ограничено '
+            'настройкой `BATCH_LOOKUP_LIMIT`.'
+        )
+        assert client.get('/api/v1/titles/?ids=1,abc').status_code == (
+            HTTPStatus.BAD_REQUEST
+        )
+        assert client.get('/api/v1/titles/?ids=').status_code == (
+            HTTPStatus.BAD_REQUEST
+        )
+
+    def test_03_reviews_by_ids(self, client, admin_client,
+                               django_user_model):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        reviews = create_many_reviews(django_user_model, titles[0]['id'], 3)
+        other = Review.objects.create(
+            title_id=titles[1]['id'], author=reviews[0].author,
+            text='other', score=5
+        )
+        ids = [reviews[2].id, other.id, reviews[0].id]
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'?ids={",".join(map(str, ids))}&fields=id,author'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'results': [
+                {'id': reviews[2].id, 'author': reviews[2].author.username},
+                {'id': reviews[0].id, 'author': reviews[0].author.username},
+            ],
+            'missing': [other.id],
+        }, (
+            'Проверьте, что `?ids=` возвращает только отзывы произведения '
+            'из url.'
+        )
+
+    def test_04_users_by_username(self, admin_client, admin, user_client):
+        response = admin_client.get(
+            f'/api/v1/users/?ids=nobody,{admin.username}'
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [user['username'] for user in data['results']] == [
+            admin.username
+        ]
+        assert data['missing'] == ['nobody']
+        assert user_client.get(
+            f'/api/v1/users/?ids={admin.username}'
+        ).status_code == HTTPStatus.FORBIDDEN
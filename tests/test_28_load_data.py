@@ -0,0 +1,133 @@
+import csv
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+FILES = {
+    'users.csv': (
+        ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'),
+        [(100 + idx, f'reader{idx}', f'reader{idx}@yamdb.fake', 'user',
+          '', '', '') for idx in range(3)],
+    ),
+    'category.csv': (
+        ('id', 'name', 'slug'),
+        [(1, 'Фильм', 'movie'), (2, 'Книга', 'book')],
+    ),
+    'genre.csv': (
+        ('id', 'name', 'slug'),
+        [(1, 'Драма', 'drama'), (2, 'Комедия', 'comedy')],
+    ),
+    'titles.csv': (
+        ('id', 'name', 'year', 'category'),
+        [(idx, f'Произведение {idx}', 2000 + idx, idx % 2 + 1)
+         for idx in range(1, 6)],
+    ),
+    'genre_title.csv': (
+        ('id', 'title_id', 'genre_id'),
+        [(idx, idx, idx % 2 + 1) for idx in range(1, 6)],
+    ),
+    'review.csv': (
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        [(idx, idx % 5 + 1, f'Отзыв {idx}', 100 + idx % 3, idx % 10 + 1,
+          '2020-01-13T23:20:02.422Z') for idx in range(1, 10)]
+        + [(10, 99, 'Отзыв без произведения', 100, 5,
+            '2020-01-13T23:20:02.422Z')],
+    ),
+    'comments.csv': (
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        [(idx, idx % 9 + 1, f'Комментарий {idx}', 100 + idx % 3,
+          '2020-01-13T23:20:02.422Z') for idx in range(1, 8)],
+    ),
+}
+
+
+def write_fixture_dir(path):
+    for file, (header, rows) in FILES.items():
+        with open(path / file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28LoadData:
+
+    def test_01_parallel_load(self, tmp_path, monkeypatch):
+        from app import functions
+        from app.management.commands import load_data
+        from reviews.models import Comment, GenreTitle, Review, Title
+        from users.models import User
+
+        assert functions.START_METHOD in ('spawn', 'forkserver'), (
+            'Проверьте, что csv разбирается в процессе, запущенном '
+            'без fork из многопоточного процесса.'
+        )
+        write_fixture_dir(tmp_path)
+        monkeypatch.setattr(load_data, 'DATA_DIR', tmp_path)
+        started = []
+        load_file = load_data.Command.load_file
+
+        def spy(self, file, batch_size):
+            started.append(file)
+            return load_file(self, file, batch_size)
+
+        monkeypatch.setattr(load_data.Command, 'load_file', spy)
+        call_command('load_data', '--workers', 3, '--batch-size', 2)
+
+        assert set(started) == set(FILES)
+        for file, dependencies in (
+            ('titles.csv', ('category.csv',)),
+            ('genre_title.csv', ('titles.csv', 'genre.csv')),
+            ('review.csv', ('titles.csv', 'users.csv')),
+            ('comments.csv', ('review.csv',)),
+        ):
+            assert all(
+                started.index(dependency) < started.index(file)
+                for dependency in dependencies
+            ), (
+                f'Проверьте, что `{file}` загружается после файлов, '
+                'на которые он ссылается.'
+            )
+        assert User.objects.filter(username__startswith='reader').count() == 3
+        assert Title.objects.count() == 5
+        assert GenreTitle.objects.count() == 5
+        assert Review.objects.count() == 9, (
+            'Проверьте, что строки со ссылкой на несуществующий объект '
+            'пропускаются.'
+        )
+        assert Comment.objects.count() == 7
+        title = Title.objects.get(pk=1)
+        assert title.review_count == Review.objects.filter(title=1).count()
+
+    def test_02_versions_and_counts(self, client, tmp_path, monkeypatch):
+        from io import StringIO
+
+        from app.management.commands import load_data
+
+        write_fixture_dir(tmp_path)
+        monkeypatch.setattr(load_data, 'DATA_DIR', tmp_path)
+        call_command('load_data', stdout=StringIO())
+        url = '/api/v1/titles/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        with open(tmp_path / 'titles.csv', 'a', encoding='utf-8') as f:
+            csv.writer(f).writerow((6, 'Новое произведение', 2006, 1))
+        out = StringIO()
+        call_command('load_data', stdout=out)
+        assert 'titles.csv: 1 строк, пропущено 0, уже были в базе 5' in (
+            out.getvalue()
+        ), (
+            'Проверьте, что `load_data` не считает загруженными строки, '
+            'которые уже были в базе.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после `load_data` меняется ETag каталога.'
+        )
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 6, (
+            'Проверьте, что после `load_data` сбрасывается кеш ответов.'
+        )